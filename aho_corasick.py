@@ -0,0 +1,254 @@
+"""Aho-Corasick multi-pattern matcher.
+
+Builds one automaton over any number of patterns and reports every hit in a
+single left-to-right pass over the text, so the cost per password depends on
+its length rather than on how many patterns there are.
+
+An automaton can be saved to a flat file and opened with MappedAhoCorasick,
+which walks it in place through mmap instead of rebuilding the trie. That is
+how the full prohibited list is matched as substrings. File layout (all
+integers little-endian uint32):
+
+    magic   b"PWACAUT1"
+    states, edges, patterns
+    edge_start[states + 1]  first edge of each state; edges are sorted by character
+    edge_char[edges]        code point of each edge
+    edge_target[edges]      state each edge leads to
+    fail[states]            failure link
+    label[states]           label + 1 of the pattern ending at the state, or 0
+    output_link[states]     nearest state on the failure chain that ends a pattern, or 0
+    depth[states]           length of the state's prefix
+"""
+import mmap
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from collections import deque
+
+MAGIC = b"PWACAUT1"
+_HEADER = struct.Struct("<8sIII")
+
+
+class AhoCorasick:
+    """Automaton over a fixed list of patterns; duplicates and empty patterns are dropped."""
+    __slots__ = ("patterns", "_goto", "_fail", "_out", "_delta")
+
+    def __init__(self, patterns):
+        self.patterns = list(dict.fromkeys(pattern for pattern in patterns if pattern))
+
+        # Trie of the patterns
+        goto = [{}]
+        out = [()]
+        for index, pattern in enumerate(self.patterns):
+            state = 0
+            for c in pattern:
+                nxt = goto[state].get(c)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][c] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = (index,)
+
+        # Failure links, breadth first so shorter states are finished first
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for c, target in goto[state].items():
+                queue.append(target)
+                f = fail[state]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                fail[target] = goto[f].get(c, 0)
+                out[target] = out[target] + out[fail[target]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        # Resolved transitions are cached here as they are first needed
+        self._delta = [dict(edges) for edges in goto]
+
+    def __len__(self):
+        return len(self.patterns)
+
+    def _step(self, state, c):
+        """Follow failure links for a transition that is not cached yet."""
+        goto = self._goto
+        fail = self._fail
+        f = state
+        while f and c not in goto[f]:
+            f = fail[f]
+        nxt = goto[f].get(c, 0)
+        self._delta[state][c] = nxt
+        return nxt
+
+    def iter_matches(self, text):
+        """Yield (start, end, pattern_index) for every occurrence, overlaps included."""
+        delta = self._delta
+        out = self._out
+        patterns = self.patterns
+        state = 0
+        for end, c in enumerate(text, 1):
+            nxt = delta[state].get(c)
+            state = self._step(state, c) if nxt is None else nxt
+            for index in out[state]:
+                yield end - len(patterns[index]), end, index
+
+    def search(self, text):
+        """Return True as soon as any pattern is found in text."""
+        delta = self._delta
+        out = self._out
+        state = 0
+        for c in text:
+            nxt = delta[state].get(c)
+            state = self._step(state, c) if nxt is None else nxt
+            if out[state]:
+                return True
+        return False
+
+    def save(self, path, labels=None):
+        """Write the automaton in the MappedAhoCorasick format.
+
+        labels[i] is the value reported for self.patterns[i] (default: i).
+        """
+        goto = self._goto
+        out = self._out
+        fail = self._fail
+        states = len(goto)
+        depth = [0] * states
+        label = [0] * states
+        output_link = [0] * states
+        edge_start = array("I", [0])
+        edge_char = array("I")
+        edge_target = array("I")
+        for state, edges in enumerate(goto):
+            for c in sorted(edges):
+                edge_char.append(ord(c))
+                edge_target.append(edges[c])
+            edge_start.append(len(edge_char))
+
+        queue = deque([0])
+        while queue:  # breadth first, so failure targets are done before their users
+            state = queue.popleft()
+            if out[state] and len(self.patterns[out[state][0]]) == depth[state]:
+                index = out[state][0]
+                label[state] = (index if labels is None else labels[index]) + 1
+            if state:
+                f = fail[state]
+                output_link[state] = f if label[f] else output_link[f]
+            for target in goto[state].values():
+                depth[target] = depth[state] + 1
+                queue.append(target)
+
+        with open(path, "wb") as file:
+            file.write(_HEADER.pack(MAGIC, states, len(edge_char), len(self.patterns)))
+            for values in (edge_start, edge_char, edge_target, array("I", fail),
+                           array("I", label), array("I", output_link), array("I", depth)):
+                if sys.byteorder != "little":
+                    values = array("I", values)
+                    values.byteswap()
+                file.write(values.tobytes())
+
+
+class MappedAhoCorasick:
+    """Read-only automaton saved with AhoCorasick.save(), walked through mmap.
+
+    Only the states a text reaches are read, so opening it is instant and
+    processes share its pages through the OS cache. Reports each pattern by
+    the label it was saved with.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"'{path}' is not a saved Aho-Corasick automaton")
+        _, states, edges, self._patterns = _HEADER.unpack_from(self._map)
+
+        sizes = [states + 1, edges, edges, states, states, states, states]
+        if sys.byteorder == "little":
+            view = memoryview(self._map)[_HEADER.size:].cast("I")
+            self._views = [view]
+        else:
+            view = array("I", self._map[_HEADER.size:])
+            view.byteswap()
+            self._views = []
+        tables = []
+        position = 0
+        for size in sizes:
+            tables.append(view[position:position + size])
+            position += size
+        self._views += [t for t in tables if isinstance(t, memoryview)]
+        (self._edge_start, self._edge_char, self._edge_target, self._fail,
+         self._label, self._output_link, self._depth) = tables
+        # Most transitions fall back to the root, so its edges are kept in a dict
+        start, end = self._edge_start[0], self._edge_start[1]
+        self._root = dict(zip(map(chr, self._edge_char[start:end]), self._edge_target[start:end]))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._map.close()
+
+    def __len__(self):
+        return self._patterns
+
+    def next_state(self, state, c):
+        """Advance the automaton by one character."""
+        edge_start = self._edge_start
+        edge_char = self._edge_char
+        code = ord(c)
+        while state:
+            lo = edge_start[state]
+            hi = edge_start[state + 1]
+            i = bisect_left(edge_char, code, lo, hi)
+            if i < hi and edge_char[i] == code:
+                return self._edge_target[i]
+            state = self._fail[state]
+        return self._root.get(c, 0)
+
+    def iter_matches(self, text):
+        """Yield (start, end, label) for every occurrence, overlaps included."""
+        label = self._label
+        output_link = self._output_link
+        depth = self._depth
+        next_state = self.next_state
+        state = 0
+        for end, c in enumerate(text, 1):
+            state = next_state(state, c)
+            hit = state if label[state] else output_link[state]
+            while hit:
+                yield end - depth[hit], end, label[hit] - 1
+                hit = output_link[hit]
+
+    def search(self, text):
+        """Return True as soon as any pattern is found in text."""
+        label = self._label
+        output_link = self._output_link
+        state = 0
+        for c in text:
+            state = self.next_state(state, c)
+            if label[state] or output_link[state]:
+                return True
+        return False
+
+    def stats(self):
+        return {
+            "patterns": self._patterns,
+            "states": len(self._fail),
+            "edges": len(self._edge_char),
+            "file_bytes": len(self._map),
+            "path": self.path,
+        }
@@ -0,0 +1,164 @@
+"""Bulk password audit.
+
+Scores a file of passwords (one per line) with the same rules as the checker
+and the prohibited-password list, spreading the work over a process pool.
+Input is streamed in chunks and at most a few chunks are in flight at once,
+so memory use does not grow with the size of the input.
+
+    python audit.py passwords.txt -o results.jsonl
+    cat passwords.txt | python audit.py - --format csv --workers 8 > results.csv
+
+Results identify passwords by line number; add --include-password to echo
+the password itself. A summary is written to stderr (or --summary FILE).
+"""
+import argparse
+import csv
+import io
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import Counter, deque
+
+import engine
+from blocklist import open_blocklist
+
+FIELDS = ["line", "score", "label", "length_score", "variety_score", "sequence_penalty", "prohibited"]
+
+# --- Worker side ---
+_blocklist = None
+
+def init_worker(blocklist_path):
+    global _blocklist
+    # Each worker maps the same compiled index, so the pages are shared.
+    _blocklist = open_blocklist(blocklist_path) if blocklist_path else set()
+
+def score_chunk(passwords):
+    """Score a list of passwords; returns one Evaluation tuple per password."""
+    blocklist = _blocklist if _blocklist is not None else engine.default_prohibited_passwords()
+    return [tuple(engine.evaluate(password, blocklist)) for password in passwords]
+
+# --- Input / output ---
+def read_chunks(stream, chunk_size):
+    """Yield lists of up to chunk_size passwords, without line endings."""
+    chunk = []
+    for line in stream:
+        chunk.append(line.rstrip("\r\n"))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+class AuditStats:
+    """Running totals over all results, in constant memory."""
+
+    def __init__(self):
+        self.count = 0
+        self.prohibited = 0
+        self.score_total = 0.0
+        self.min_score = None
+        self.max_score = None
+        self.labels = Counter()
+
+    def add(self, evaluation):
+        score, label = evaluation[0], evaluation[1]
+        self.count += 1
+        self.prohibited += evaluation[5]
+        self.score_total += score
+        self.min_score = score if self.min_score is None else min(self.min_score, score)
+        self.max_score = score if self.max_score is None else max(self.max_score, score)
+        self.labels[label] += 1
+
+    def summary(self, elapsed):
+        return {
+            "passwords": self.count,
+            "prohibited": self.prohibited,
+            "mean_score": round(self.score_total / self.count, 2) if self.count else None,
+            "min_score": self.min_score,
+            "max_score": self.max_score,
+            "labels": dict(self.labels),
+            "seconds": round(elapsed, 3),
+            "passwords_per_second": round(self.count / elapsed) if elapsed else None,
+        }
+
+def make_writer(out, fmt, include_password):
+    fields = FIELDS + (["password"] if include_password else [])
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(fields)
+        return lambda row: writer.writerow(row)
+    return lambda row: out.write(json.dumps(dict(zip(fields, row)), ensure_ascii=False) + "\n")
+
+# --- Driver ---
+def audit(stream, out, fmt="jsonl", workers=None, chunk_size=5000,
+          blocklist_path=engine.PROHIBITED_FILE, include_password=False):
+    """Score every line of stream, write results to out and return the summary dict."""
+    workers = workers or os.cpu_count() or 1
+    write = make_writer(out, fmt, include_password)
+    stats = AuditStats()
+    start = time.perf_counter()
+    line = 0
+
+    def emit(passwords, results):
+        nonlocal line
+        for password, evaluation in zip(passwords, results):
+            line += 1
+            stats.add(evaluation)
+            row = [line, *evaluation[:6]]
+            if include_password:
+                row.append(password)
+            write(row)
+
+    if workers == 1:
+        init_worker(blocklist_path)
+        for chunk in read_chunks(stream, chunk_size):
+            emit(chunk, score_chunk(chunk))
+    else:
+        with multiprocessing.Pool(workers, init_worker, (blocklist_path,)) as pool:
+            pending = deque()  # results kept in input order
+            for chunk in read_chunks(stream, chunk_size):
+                pending.append((chunk, pool.apply_async(score_chunk, (chunk,))))
+                if len(pending) >= workers * 2:
+                    chunk, result = pending.popleft()
+                    emit(chunk, result.get())
+            while pending:
+                chunk, result = pending.popleft()
+                emit(chunk, result.get())
+
+    return stats.summary(time.perf_counter() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Audit a file of passwords against the checker's rules.")
+    parser.add_argument("input", help="file with one password per line, or - for stdin")
+    parser.add_argument("-o", "--output", help="results file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="passwords per task")
+    parser.add_argument("--blocklist", default=engine.PROHIBITED_FILE, help="prohibited-password list")
+    parser.add_argument("--include-password", action="store_true", help="echo each password in the results")
+    parser.add_argument("--summary", help="write the summary JSON here instead of stderr")
+    args = parser.parse_args(argv)
+
+    if args.input == "-":
+        stream = io.TextIOWrapper(sys.stdin.buffer, encoding="utf-8", errors="replace")
+    else:
+        stream = open(args.input, "r", encoding="utf-8", errors="replace")
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        summary = audit(stream, out, args.format, args.workers, args.chunk_size,
+                        args.blocklist, args.include_password)
+    finally:
+        stream.close()
+        if out is not sys.stdout:
+            out.close()
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+    else:
+        print(json.dumps(summary, indent=2), file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,231 @@
+"""Vectorized batch scoring.
+
+score_batch() gives the same numbers as engine.total_score() and
+engine.strength_label() for a whole list of passwords at once. The batch is
+packed into one flat array of code points plus Arrow-style offsets, and the
+length, class and sequence scores are computed with NumPy array operations
+instead of once per Python string.
+
+NumPy is optional: without it score_batch() falls back to the scalar engine
+and returns plain lists with the same fields.
+
+    python batch.py --sizes 10000 100000 1000000   # benchmark against the scalar path
+"""
+import argparse
+import random
+import string
+import time
+from collections import namedtuple
+
+import engine
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+LABELS = ("Very Weak", "Weak", "Moderate", "Strong", "Very Strong")
+_LABEL_BOUNDS = (20, 40, 60, 80)  # upper bounds of the first four labels, as in strength_label
+# total_score weights on any other component send the batch to the scalar engine.
+_VECTORIZED_COMPONENTS = {"length", "variety", "sequence"}
+
+# Arrays (or lists without NumPy) with one entry per password. The last
+# four fields match the tuple returned by engine.total_score().
+BatchScores = namedtuple("BatchScores", ["label", "score", "length_score", "variety_score", "sequence_penalty"])
+
+
+def _score_batch_scalar(passwords):
+    label, score, length, variety, penalty = [], [], [], [], []
+    for password in passwords:
+        total, len_score, var_score, seq_penalty = engine.total_score(password)
+        label.append(engine.strength_label(total))
+        score.append(total)
+        length.append(len_score)
+        variety.append(var_score)
+        penalty.append(seq_penalty)
+    return BatchScores(label, score, length, variety, penalty)
+
+
+def pack(passwords):
+    """Return (code_points, offsets, lengths) for a list of strings."""
+    lengths = np.fromiter(map(len, passwords), dtype=np.int64, count=len(passwords))
+    offsets = np.zeros(len(passwords) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    code_points = np.frombuffer("".join(passwords).encode("utf-32-le", "surrogatepass"), dtype="<u4")
+    return code_points, offsets, lengths
+
+
+_ASCII_CLASS = None
+
+def _ascii_class():
+    global _ASCII_CLASS
+    if _ASCII_CLASS is None:
+        _ASCII_CLASS = np.array([engine.profile(chr(i)).mask for i in range(128)], dtype=np.uint8)
+    return _ASCII_CLASS
+
+
+def _class_bits(code_points):
+    """Class bits (engine.LOWER etc., OR-ed) of every code point."""
+    is_ascii = code_points < 128
+    bits = _ascii_class()[np.where(is_ascii, code_points, 0)]
+    if not is_ascii.all():
+        others = code_points[~is_ascii]
+        unique, inverse = np.unique(others, return_inverse=True)
+        classes = np.array([engine.profile(chr(c)).mask for c in unique.tolist()], dtype=np.uint8)
+        bits[~is_ascii] = classes[inverse]
+    return bits
+
+
+_NO_STEP = 255
+_STEP_TABLES = None
+
+def _step_tables():
+    """For each of engine.SEQUENCE_GRAPHS: (step table, opposites, forward).
+
+    The step table gives the direction between two ASCII characters (or
+    _NO_STEP), opposites maps a direction to the opposite one and forward is
+    the direction along a row.
+    """
+    global _STEP_TABLES
+    if _STEP_TABLES is None:
+        _STEP_TABLES = []
+        for graph in engine.SEQUENCE_GRAPHS:
+            table = np.full((128, 128), _NO_STEP, dtype=np.uint8)
+            for pair, direction in graph.steps.items():
+                if pair.isascii():
+                    table[ord(pair[0]), ord(pair[1])] = ord(direction) - ord("0")
+            opposites = np.full(256, _NO_STEP - 1, dtype=np.uint8)  # never a direction
+            for direction, back in graph.opposites.items():
+                opposites[ord(direction) - ord("0")] = ord(back) - ord("0")
+            _STEP_TABLES.append((table, opposites, ord(graph.forward) - ord("0")))
+    return _STEP_TABLES
+
+
+def _sequence_hits(passwords, code_points, segment, ascii_rows):
+    """Sequence hits per password, as engine.sequence_hits().
+
+    For every graph, each pair of neighbouring characters is looked up in
+    the graph's step table, and a step straight back the way the one before
+    came is dropped. Runs of steps are the walks, and a direction that
+    differs from the step before is a turn. Walks are then scored by shape and
+    summed per password with bincount; common words are counted by
+    comparing shifted slices of the lowercased text.
+    """
+    n = len(passwords)
+    hits = np.zeros(n, dtype=np.int64)
+    if len(code_points) > 1:
+        ascii_code_points = np.where(code_points < 128, code_points, 0)
+        # pairs that lie within one password, and an ASCII one
+        inside = (segment[:-1] == segment[1:]) & ascii_rows[segment[:-1]]
+        for table, opposites, forward in _step_tables():
+            direction = np.where(inside, table[ascii_code_points[:-1], ascii_code_points[1:]], _NO_STEP)
+            is_step = direction != _NO_STEP
+            is_step[1:] &= direction[1:] != opposites[direction[:-1]]
+            first_step = is_step.copy()
+            first_step[1:] &= ~is_step[:-1]
+            walks = int(first_step.sum())
+            if not walks:
+                continue
+            walk_of = np.cumsum(first_step) - 1  # walk each step belongs to
+            length = np.bincount(walk_of[is_step], minlength=walks) + 1
+            turned = is_step[1:] & is_step[:-1] & (direction[1:] != direction[:-1])
+            turns = np.bincount(walk_of[1:][turned], minlength=walks) + 1
+            starts = np.flatnonzero(first_step)
+            minimum = np.where(turns > 1, engine.SEQUENCE_MIN_TURNING,
+                               np.where(direction[starts] == forward, engine.SEQUENCE_MIN_ROW,
+                                        engine.SEQUENCE_MIN_WALK))
+            walk_hits = np.where(length >= minimum,
+                                 np.floor(length - 2 - engine.SEQUENCE_TURN_COST * (turns - 1)), 0)
+            graph_hits = np.bincount(segment[starts], weights=walk_hits, minlength=n)
+            np.maximum(hits, graph_hits.astype(np.int64), out=hits)
+
+        upper = (ascii_code_points >= ord("A")) & (ascii_code_points <= ord("Z"))
+        lowered = np.where(upper, ascii_code_points + (ord("a") - ord("A")), ascii_code_points)
+        for word in engine.SEQUENCE_WORDS:
+            if len(lowered) < len(word):
+                continue
+            width = len(lowered) - len(word) + 1
+            match = segment[:width] == segment[len(word) - 1:]
+            for k, c in enumerate(word):
+                match &= lowered[k:k + width] == ord(c)
+            hits += np.bincount(segment[:width][match], minlength=n)
+
+    # Non-ASCII passwords use the scalar walk search.
+    for i in np.flatnonzero(~ascii_rows).tolist():
+        hits[i] = engine.sequence_hits(passwords[i])
+    return hits
+
+
+def score_batch(passwords):
+    """Score a list of passwords; returns BatchScores of NumPy arrays (lists without NumPy)."""
+    passwords = list(passwords)
+    weights = engine.scorer_weights("total_score")
+    if np is None or set(weights) - _VECTORIZED_COMPONENTS:
+        return _score_batch_scalar(passwords)
+
+    n = len(passwords)
+    code_points, offsets, lengths = pack(passwords)
+    segment = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    bits = _class_bits(code_points)
+
+    types_used = np.zeros(n, dtype=np.int64)
+    for bit in (engine.LOWER, engine.UPPER, engine.DIGIT, engine.SYMBOL):
+        types_used += np.bincount(segment[(bits & bit) != 0], minlength=n) > 0
+    non_ascii = np.bincount(segment[code_points >= 128], minlength=n) > 0
+
+    length_score = np.minimum(lengths * 5, 100)
+    length_score = np.maximum(np.where(lengths < 6, length_score - (6 - lengths) * 10, length_score), 0)
+
+    variety_score = np.array([0, 25, 50, 75, 100], dtype=np.int64)[types_used]
+    variety_score = np.maximum(np.where((types_used == 1) & (lengths <= 6), variety_score - 20, variety_score), 0)
+
+    seq_penalty = np.minimum(_sequence_hits(passwords, code_points, segment, ~non_ascii) * 10, 100)
+
+    score = np.maximum((length_score * weights.get("length", 0.0)) + (variety_score * weights.get("variety", 0.0))
+                       + (seq_penalty * weights.get("sequence", 0.0)), 0)
+    label = np.array(LABELS, dtype=object)[np.searchsorted(_LABEL_BOUNDS, score, side="left")]
+    return BatchScores(label, score, np.round(length_score / 10).astype(np.int64),
+                       np.round(variety_score / 10).astype(np.int64),
+                       np.round(seq_penalty / 10).astype(np.int64))
+
+
+def sequence_hits(passwords):
+    """Sequence hits per password, as engine.sequence_hits()."""
+    passwords = list(passwords)
+    if np is None:
+        return [engine.sequence_hits(p) for p in passwords]
+    n = len(passwords)
+    code_points, offsets, lengths = pack(passwords)
+    segment = np.repeat(np.arange(n, dtype=np.int64), lengths)
+    non_ascii = np.bincount(segment[code_points >= 128], minlength=n) > 0
+    return _sequence_hits(passwords, code_points, segment, ~non_ascii)
+
+
+def _random_passwords(count, seed=0):
+    rng = random.Random(seed)
+    charset = string.ascii_letters + string.digits + "!@#$%^&*"
+    return ["".join(rng.choices(charset, k=rng.randint(4, 20))) for _ in range(count)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark score_batch() against the scalar engine.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args(argv)
+    if np is None:
+        parser.error("NumPy is not installed")
+
+    for size in args.sizes:
+        passwords = _random_passwords(size)
+        start = time.perf_counter()
+        scalar = _score_batch_scalar(passwords)
+        scalar_time = time.perf_counter() - start
+        start = time.perf_counter()
+        vector = score_batch(passwords)
+        vector_time = time.perf_counter() - start
+        assert list(vector.score) == scalar.score and list(vector.label) == scalar.label
+        print(f"{size:>9} passwords: scalar {scalar_time:.3f}s, batch {vector_time:.3f}s, "
+              f"{scalar_time / vector_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+"""Benchmark suite for the hot paths.
+
+Times blocklist loading and membership, every scorer, feedback, password
+generation, the strengthener and the start-up time of both GUI scripts,
+on two reproducible corpora: synthetic passwords drawn from a seeded RNG
+and a seeded sample of prohibited.txt. It also reports the memory the
+substring automaton takes to build and to keep open.
+
+    python bench.py                                  # print results
+    python bench.py --save baseline.json             # record a baseline
+    python bench.py --compare baseline.json --threshold 0.2
+
+With --compare the run exits with status 1 if any case is more than
+threshold (a fraction: 0.2 is 20%) slower than its baseline.
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import string
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import engine
+import generator
+import strengthen
+from blocklist import (compile_substring_index, iter_prohibited_entries, load_prohibited_passwords,
+                       open_blocklist, open_substring_index)
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+_RUN_ONCE = {"substring_index.build"}  # cases too slow to repeat
+PROHIBITED_FILE = os.path.join(HERE, engine.PROHIBITED_FILE)
+
+# Runs mainloop() once and exits, printing how long the script took to get there.
+_STARTUP_PROBE = """
+import runpy, sys, time, tkinter
+start = time.perf_counter()
+def mainloop(self, n=0):
+    self.update()
+    print("startup_ms", (time.perf_counter() - start) * 1000, flush=True)
+    self.destroy()
+tkinter.Misc.mainloop = mainloop
+sys.argv = [sys.argv[1]]
+runpy.run_path(sys.argv[0], run_name="__main__")
+"""
+
+# The non-GUI modules test.py imports; timed on their own so start-up is tracked without a display.
+_IMPORT_PROBE = """
+import time
+start = time.perf_counter()
+import engine, view_model, scoring_pool, cache, generator, strengthen
+print("startup_ms", (time.perf_counter() - start) * 1000, flush=True)
+"""
+
+
+# --- Corpora ---
+
+# Straight keyboard walks and alphabet runs, for the synthetic passwords that contain one
+_WALKS = sorted(set().union(*(graph.straight_walks(engine.SEQUENCE_MIN_WALK)
+                              for graph in engine.SEQUENCE_GRAPHS)))
+
+
+def synthetic_corpus(size, seed):
+    """Passwords of length 0-24 from every mix of classes, some with keyboard walks."""
+    rng = random.Random(seed)
+    pools = [string.ascii_lowercase, string.ascii_uppercase, string.digits, generator.SYMBOLS]
+    corpus = []
+    for _ in range(size):
+        charset = "".join(rng.sample(pools, rng.randint(1, 4)))
+        password = "".join(rng.choice(charset) for _ in range(rng.randint(0, 24)))
+        if rng.random() < 0.2:
+            cut = rng.randint(0, len(password))
+            password = password[:cut] + rng.choice(_WALKS) + password[cut:]
+        corpus.append(password)
+    return corpus
+
+
+def prohibited_corpus(size, seed):
+    entries = list(iter_prohibited_entries(PROHIBITED_FILE))
+    return random.Random(seed).sample(entries, min(size, len(entries)))
+
+
+# --- Timing ---
+
+def time_per_op(fn, ops, repeat):
+    """Best of repeat runs of fn(), in nanoseconds per operation."""
+    best = float("inf")
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter_ns()
+            fn()
+            best = min(best, time.perf_counter_ns() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best / ops
+
+
+def over(func, corpus):
+    def run():
+        for password in corpus:
+            func(password)
+    return run
+
+
+def startup_ms(probe, args, repeat):
+    """Best start-up time a probe reports in a fresh interpreter, or None if it cannot run here."""
+    best = None
+    for _ in range(repeat):
+        try:
+            result = subprocess.run([sys.executable, "-c", probe, *args],
+                                    cwd=HERE, capture_output=True, text=True, timeout=60)
+        except subprocess.TimeoutExpired:
+            return None
+        lines = [line for line in result.stdout.splitlines() if line.startswith("startup_ms ")]
+        if result.returncode != 0 or not lines:
+            return None
+        ms = float(lines[-1].split()[1])
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+# --- Cases ---
+
+def cases(size, seed):
+    """Yield (name, fn, ops): fn runs ops operations of the named path."""
+    synthetic = synthetic_corpus(size, seed)
+    prohibited = prohibited_corpus(size, seed)
+    blocklist_set = load_prohibited_passwords(PROHIBITED_FILE)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        index = open_blocklist(PROHIBITED_FILE, os.path.join(tmp, "bench.idx"))
+        filtered = open_blocklist(PROHIBITED_FILE, os.path.join(tmp, "bench.idx"),
+                                  bloom_fp_rate=0.01, bloom_path=os.path.join(tmp, "bench.bloom"))
+        normalized = open_blocklist(PROHIBITED_FILE, os.path.join(tmp, "bench.idx"), normalized=True,
+                                    canonical_path=os.path.join(tmp, "bench.canon.idx"))
+
+        yield "load_prohibited_passwords", lambda: load_prohibited_passwords(PROHIBITED_FILE), 1
+        yield "open_blocklist.index", lambda: open_blocklist(PROHIBITED_FILE,
+                                                             os.path.join(tmp, "bench.idx")).close(), 1
+        for name, container in [("set", blocklist_set), ("index", index), ("bloom", filtered),
+                                ("normalized", normalized)]:
+            yield f"membership.{name}.hit", over(container.__contains__, prohibited), len(prohibited)
+            yield f"membership.{name}.miss", over(container.__contains__, synthetic), len(synthetic)
+
+        substring_path = os.path.join(tmp, "bench.ac")
+        yield "substring_index.build", lambda: compile_substring_index(PROHIBITED_FILE, substring_path), 1
+        substrings = open_substring_index(PROHIBITED_FILE, substring_path)
+        embedded = [f"x{word}2024!" for word in prohibited]
+        yield "substring_index.open", lambda: open_substring_index(PROHIBITED_FILE, substring_path).close(), 1
+        yield "substring_index.hit", over(lambda p: list(substrings.iter_matches(p.lower())), embedded), len(embedded)
+        yield "substring_index.miss", over(lambda p: list(substrings.iter_matches(p.lower())), synthetic), len(synthetic)
+
+        for corpus_name, corpus in [("synthetic", synthetic), ("prohibited", prohibited)]:
+            for func in (engine.score_length, engine.score_variety, engine.score_keyboard_sequence,
+                         engine.total_score, engine.generate_feedback, engine.estimate_guesses):
+                yield f"{func.__name__}.{corpus_name}", over(func, corpus), len(corpus)
+            yield f"evaluate.{corpus_name}", over(lambda p: engine.evaluate(p, index), corpus), len(corpus)
+
+        generations = max(1, size // 10)
+        for mode in generator.MODES:
+            yield (f"generate_password.{mode}",
+                   lambda mode=mode: [generator.generate_password(mode, 12, index) for _ in range(generations)],
+                   generations)
+
+        # Seeded searches without a time budget (max_edits still bounds them),
+        # so every run does the same work whatever the machine's speed.
+        starts = synthetic_corpus(10, seed + 1)
+        for target in strengthen.THRESHOLDS:
+            yield (f"strengthen.{target.replace(' ', '_')}",
+                   lambda target=target: [strengthen.strengthen(p, target, time_budget=math.inf,
+                                                                prohibited_passwords=index,
+                                                                rng=random.Random(seed + i))
+                                          for i, p in enumerate(starts)],
+                   len(starts))
+
+        substrings.close()
+        index.close()
+        filtered.close()
+        normalized.close()
+
+
+def memory_usage():
+    """Return {case: bytes} for the substring automaton.
+
+    build_peak is the peak Python heap while compiling prohibited.txt,
+    file the size of the saved automaton and open_heap what opening it
+    allocates (its arrays are mapped from the file rather than copied).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.ac")
+        tracemalloc.start()
+        try:
+            compile_substring_index(PROHIBITED_FILE, path)
+            _, build_peak = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            substrings = open_substring_index(PROHIBITED_FILE, path)
+            after, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        usage = {
+            "substring_index.memory.build_peak": build_peak,
+            "substring_index.memory.file": substrings.stats()["file_bytes"],
+            "substring_index.memory.open_heap": after - before,
+        }
+        substrings.close()
+    return usage
+
+
+def format_bytes(n):
+    for unit, scale in (("MB", 1 << 20), ("KB", 1 << 10)):
+        if n >= scale:
+            return f"{n / scale:.1f} {unit}"
+    return f"{n} B"
+
+
+def run(size=2000, seed=1234, repeat=5, only=None, startup=True):
+    """Return {case: nanoseconds per operation}; a start-up case times one whole start-up."""
+    results = {}
+    for name, fn, ops in cases(size, seed):
+        if only and not any(pattern in name for pattern in only):
+            continue
+        results[name] = time_per_op(fn, ops, 1 if name in _RUN_ONCE else repeat)
+        print(f"{name:<42} {format_ns(results[name]):>12}", flush=True)
+    if startup:
+        probes = [("startup.imports", _IMPORT_PROBE, [])]
+        probes += [(f"startup.{script}", _STARTUP_PROBE, [os.path.join(HERE, script)])
+                   for script in ("password_checker.py", "test.py")]
+        for name, probe, probe_args in probes:
+            if only and not any(pattern in name for pattern in only):
+                continue
+            ms = startup_ms(probe, probe_args, max(1, repeat // 2))
+            if ms is None:
+                print(f"{name:<42} {'skipped':>12}  (cannot start here: no display or GUI dependency)")
+                continue
+            results[name] = ms * 1e6
+            print(f"{name:<42} {format_ns(results[name]):>12}", flush=True)
+    return results
+
+
+def format_ns(ns):
+    for unit, scale in (("s", 1e9), ("ms", 1e6), ("µs", 1e3)):
+        if ns >= scale:
+            return f"{ns / scale:.2f} {unit}"
+    return f"{ns:.0f} ns"
+
+
+def compare(results, baseline, threshold):
+    """Return the cases more than threshold slower than baseline, as (name, old, new) tuples."""
+    regressions = []
+    for name, new in results.items():
+        old = baseline.get(name)
+        if old and new > old * (1 + threshold):
+            regressions.append((name, old, new))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the password checker's hot paths.")
+    parser.add_argument("--size", type=int, default=2000, help="passwords per corpus")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case; the best is kept")
+    parser.add_argument("--only", action="append", help="run only cases whose name contains this (repeatable)")
+    parser.add_argument("--no-startup", action="store_true", help="skip the GUI start-up cases")
+    parser.add_argument("--save", metavar="FILE", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", help="fail if a case regressed against this baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown against the baseline, as a fraction (default: 0.25)")
+    args = parser.parse_args(argv)
+
+    results = run(args.size, args.seed, args.repeat, args.only, not args.no_startup)
+    memory = {}
+    if not args.only or any(pattern in "substring_index.memory" for pattern in args.only):
+        memory = memory_usage()
+        for name, n in memory.items():
+            print(f"{name:<42} {format_bytes(n):>12}", flush=True)
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "size": args.size,
+                "seed": args.seed,
+                "unit": "ns per operation",
+                "results": results,
+                "memory": memory,  # bytes
+            }, f, indent=2, sort_keys=True)
+        print(f"Baseline written to {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if (baseline.get("size"), baseline.get("seed")) != (args.size, args.seed):
+            print("Warning: the baseline was recorded with a different --size or --seed")
+        regressions = compare(results, baseline["results"], args.threshold)
+        for name, old, new in regressions:
+            print(f"REGRESSION {name}: {format_ns(old)} -> {format_ns(new)} (+{(new / old - 1) * 100:.0f}%)")
+        if regressions:
+            sys.exit(1)
+        print(f"No case regressed by more than {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,486 @@
+"""Prohibited-password lists.
+
+prohibited.txt is compiled once into a sorted binary index which is then
+opened with mmap, so startup does not parse the text file and processes using
+the same index share its pages through the OS cache.
+
+Index layout (all integers little-endian uint32):
+
+    magic  b"PWBLIDX1"
+    count  number of entries
+    offsets[count + 1]  start of each entry in the data block, plus the end
+    data   UTF-8 entries, sorted bytewise, no separators
+
+Build it ahead of time with ``python blocklist.py prohibited.txt``. Very
+large lists can add a Bloom filter in front of the index (``--bloom 0.01``)
+so that most misses are answered without searching it.
+
+With normalized=True, open_blocklist() also compiles the canonical forms of
+the entries (see normalize.py) into a second index of the same layout,
+SOURCE with .canon.idx, so variants like "P@ssw0rd" or "Qwerty123!" are
+caught with a few lookups.
+
+For finding prohibited words inside longer passwords ("xXdragonXx"), the
+lowercased list is also compiled into an Aho-Corasick automaton saved next to
+it (``--substrings``, SOURCE with .ac). Each match is reported with the
+word's rank: its position in the list, counting each lowercased word once.
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+import time
+
+from aho_corasick import AhoCorasick, MappedAhoCorasick
+from bloom import BloomFilter
+import normalize
+
+MAGIC = b"PWBLIDX1"
+_UINT32 = struct.Struct("<I")
+_HEADER_SIZE = len(MAGIC) + _UINT32.size
+
+
+def iter_prohibited_entries(filename):
+    """Yield the stripped, non-empty entries of a text blocklist.
+
+    The first line of the bundled list is the URL it was taken from; it is
+    skipped rather than treated as a password.
+    """
+    with open(filename, 'r', encoding='utf-8', errors='ignore') as file:
+        for line_number, line in enumerate(file):
+            entry = line.strip()
+            if not entry:
+                continue
+            if line_number == 0 and entry.startswith(("http://", "https://")):
+                continue
+            yield entry
+
+
+def load_prohibited_passwords(filename):
+    try:
+        return set(iter_prohibited_entries(filename))
+    except FileNotFoundError:
+        print(f"Warning: '{filename}' not found.")
+        return set()
+
+
+def index_path_for(source):
+    """Default location of the compiled index for a text blocklist."""
+    return os.path.splitext(source)[0] + ".idx"
+
+
+def bloom_path_for(source):
+    """Default location of the Bloom filter for a text blocklist."""
+    return os.path.splitext(source)[0] + ".bloom"
+
+
+def canonical_path_for(source):
+    """Default location of the canonical-form index for a text blocklist."""
+    return os.path.splitext(source)[0] + ".canon.idx"
+
+
+def substring_path_for(source):
+    """Default location of the substring automaton for a text blocklist."""
+    return os.path.splitext(source)[0] + ".ac"
+
+
+def _substring_automaton(source):
+    """Automaton over the lowercased entries; pattern index == rank."""
+    return AhoCorasick(dict.fromkeys(entry.lower() for entry in iter_prohibited_entries(source)))
+
+
+def compile_substring_index(source, dest=None):
+    """Compile a text blocklist into a saved substring automaton and return its path."""
+    dest = dest or substring_path_for(source)
+    tmp = f"{dest}.tmp{os.getpid()}"
+    _substring_automaton(source).save(tmp)
+    os.replace(tmp, dest)
+    return dest
+
+
+def compile_blocklist(source, dest=None):
+    """Compile a text blocklist into a sorted binary index and return its path."""
+    dest = dest or index_path_for(source)
+    return _write_index({e.encode("utf-8") for e in iter_prohibited_entries(source)}, dest)
+
+
+def compile_canonical_index(source, dest=None):
+    """Compile the canonical forms of a text blocklist's entries into an index and return its path."""
+    dest = dest or canonical_path_for(source)
+    return _write_index({normalize.canonical_form(e).encode("utf-8") for e in iter_prohibited_entries(source)}, dest)
+
+
+def _write_index(entries, dest):
+    entries = sorted(entries)
+    offsets = bytearray()
+    position = 0
+    for entry in entries:
+        offsets += _UINT32.pack(position)
+        position += len(entry)
+    offsets += _UINT32.pack(position)
+
+    tmp = f"{dest}.tmp{os.getpid()}"
+    with open(tmp, "wb") as file:
+        file.write(MAGIC)
+        file.write(_UINT32.pack(len(entries)))
+        file.write(offsets)
+        for entry in entries:
+            file.write(entry)
+    os.replace(tmp, dest)  # readers never see a half-written index
+    return dest
+
+
+class BlocklistIndex:
+    """Read-only, memory-mapped view of a compiled blocklist.
+
+    Supports ``in``, ``len`` and iteration. Lookups are a binary search over
+    the mapped file, so only the pages a lookup touches are read.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"'{path}' is not a compiled blocklist")
+        self._count = _UINT32.unpack_from(self._map, len(MAGIC))[0]
+        self._data_start = _HEADER_SIZE + (self._count + 1) * _UINT32.size
+        if sys.byteorder == "little":
+            # Index the offsets table in place instead of unpacking per probe
+            self._offsets = memoryview(self._map)[_HEADER_SIZE:self._data_start].cast("I")
+        else:
+            self._offsets = [_UINT32.unpack_from(self._map, _HEADER_SIZE + i * _UINT32.size)[0]
+                             for i in range(self._count + 1)]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if isinstance(self._offsets, memoryview):
+            self._offsets.release()
+        self._map.close()
+
+    def __len__(self):
+        return self._count
+
+    def _entry(self, i):
+        base = self._data_start
+        return self._map[base + self._offsets[i]:base + self._offsets[i + 1]]
+
+    def __iter__(self):
+        for i in range(self._count):
+            yield self._entry(i).decode("utf-8")
+
+    def entry(self, i):
+        """The i-th entry in index order."""
+        return self._entry(i).decode("utf-8")
+
+    def iter_bytes(self):
+        """Yield the entries as UTF-8 bytes, in index order."""
+        for i in range(self._count):
+            yield self._entry(i)
+
+    def contains_bytes(self, key):
+        """Membership test for an already UTF-8 encoded password."""
+        data = self._map
+        offsets = self._offsets
+        base = self._data_start
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            entry = data[base + offsets[mid]:base + offsets[mid + 1]]
+            if entry < key:
+                lo = mid + 1
+            elif entry > key:
+                hi = mid
+            else:
+                return True
+        return False
+
+    def __contains__(self, password):
+        if not isinstance(password, str):
+            return False
+        return self.contains_bytes(password.encode("utf-8", "surrogatepass"))
+
+    def stats(self):
+        """Size information about the index."""
+        return {
+            "entries": self._count,
+            "index_bytes": len(self._map),
+            "path": self.path,
+        }
+
+
+class FilteredBlocklist:
+    """A BlocklistIndex with a Bloom filter in front of it.
+
+    Only passwords the filter reports as present are searched for in the
+    exact index, so the answer is always exact.
+    """
+
+    def __init__(self, index, bloom):
+        self.index = index
+        self.bloom = bloom
+        self.lookups = 0
+        self.filter_rejects = 0
+        self.false_positives = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.bloom.close()
+        self.index.close()
+
+    def __len__(self):
+        return len(self.index)
+
+    def __iter__(self):
+        return iter(self.index)
+
+    def contains_bytes(self, key):
+        self.lookups += 1
+        if key not in self.bloom:
+            self.filter_rejects += 1
+            return False
+        if self.index.contains_bytes(key):
+            return True
+        self.false_positives += 1
+        return False
+
+    def __contains__(self, password):
+        if not isinstance(password, str):
+            return False
+        return self.contains_bytes(password.encode("utf-8", "surrogatepass"))
+
+    def stats(self):
+        """Index stats plus the filter's size and its false-positive rate so far."""
+        negatives = self.filter_rejects + self.false_positives
+        stats = self.index.stats()
+        stats.update({
+            "bloom_bytes": self.bloom.size_bytes,
+            "bloom_hashes": self.bloom.hashes,
+            "bloom_expected_fp_rate": self.bloom.expected_fp_rate(len(self.index)),
+            "lookups": self.lookups,
+            "filter_rejects": self.filter_rejects,
+            "false_positives": self.false_positives,
+            "measured_fp_rate": self.false_positives / negatives if negatives else 0.0,
+        })
+        return stats
+
+
+class NormalizedBlocklist:
+    """An exact blocklist plus an index of its entries' canonical forms.
+
+    A password is prohibited if it is in the exact list, or if one of its
+    normalize.candidate_forms() is the canonical form of an entry.
+    """
+
+    def __init__(self, exact, canonical):
+        self.exact = exact
+        self.canonical = canonical
+        self.variant_hits = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        for blocklist in (self.canonical, self.exact):
+            if hasattr(blocklist, "close"):
+                blocklist.close()
+
+    def __len__(self):
+        return len(self.exact)
+
+    def __iter__(self):
+        return iter(self.exact)
+
+    def variant_of(self, password):
+        """The canonical form password shares with a prohibited entry, or None."""
+        for form in normalize.candidate_forms(password):
+            if form in self.canonical:
+                return form
+        return None
+
+    def __contains__(self, password):
+        if not isinstance(password, str):
+            return False
+        if password in self.exact:
+            return True
+        if self.variant_of(password) is not None:
+            self.variant_hits += 1
+            return True
+        return False
+
+    def stats(self):
+        stats = self.exact.stats() if hasattr(self.exact, "stats") else {"entries": len(self.exact)}
+        stats.update({"canonical_entries": len(self.canonical), "variant_hits": self.variant_hits})
+        return stats
+
+
+def build_bloom(index, fp_rate, path):
+    """Build a Bloom filter over a compiled index and save it to path."""
+    bloom = BloomFilter.build(index.iter_bytes(), fp_rate)
+    tmp = f"{path}.tmp{os.getpid()}"
+    bloom.save(tmp)
+    os.replace(tmp, path)
+    return path
+
+
+def _open_bloom(path, capacity, fp_rate):
+    """The saved filter at path if it was sized for capacity entries at fp_rate, otherwise None."""
+    try:
+        bloom = BloomFilter.load(path)
+    except ValueError:  # saved in an older format
+        return None
+    if bloom.capacity == capacity and bloom.fp_rate == fp_rate:
+        return bloom
+    bloom.close()
+    return None
+
+
+def _is_stale(path, source_mtime):
+    try:
+        return source_mtime is not None and os.path.getmtime(path) < source_mtime
+    except OSError:
+        return True
+
+
+def open_blocklist(source, index_path=None, bloom_fp_rate=None, bloom_path=None,
+                   normalized=False, canonical_path=None):
+    """Open the compiled index for source, rebuilding it if it is missing or stale.
+
+    With bloom_fp_rate set, a Bloom filter at that false-positive rate is
+    built (or reused, if one was saved for the same rate and number of
+    entries) and put in front of the index. With normalized set,
+    the result is a NormalizedBlocklist that also catches leet, case and
+    affix variants. Falls back to in-memory sets if the files cannot be
+    written, and to an empty set if the source list does not exist.
+    """
+    exact = _open_exact(source, index_path, bloom_fp_rate, bloom_path)
+    if not normalized or not exact:
+        return exact
+    canonical_path = canonical_path or canonical_path_for(source)
+    try:
+        # The forms depend on normalize.py's rules as well as on the list
+        source_mtime = max(os.path.getmtime(source), os.path.getmtime(normalize.__file__))
+    except OSError:
+        source_mtime = None  # a prebuilt index is used as it is
+        if not os.path.exists(canonical_path):
+            print(f"Warning: '{canonical_path}' not found; variants will not be checked.")
+            return exact
+
+    try:
+        if _is_stale(canonical_path, source_mtime):
+            compile_canonical_index(source, canonical_path)
+        canonical = BlocklistIndex(canonical_path)
+    except OSError:
+        canonical = {normalize.canonical_form(e) for e in iter_prohibited_entries(source)}
+    return NormalizedBlocklist(exact, canonical)
+
+
+def _open_exact(source, index_path, bloom_fp_rate, bloom_path):
+    index_path = index_path or index_path_for(source)
+    try:
+        source_mtime = os.path.getmtime(source)
+    except OSError:
+        source_mtime = None
+        if not os.path.exists(index_path):
+            print(f"Warning: '{source}' not found.")
+            return set()
+
+    try:
+        if _is_stale(index_path, source_mtime):
+            compile_blocklist(source, index_path)
+        index = BlocklistIndex(index_path)
+        if bloom_fp_rate is None:
+            return index
+        bloom_path = bloom_path or bloom_path_for(source)
+        bloom = None
+        if not _is_stale(bloom_path, os.path.getmtime(index_path)):
+            bloom = _open_bloom(bloom_path, len(index), bloom_fp_rate)
+        if bloom is None:
+            build_bloom(index, bloom_fp_rate, bloom_path)
+            bloom = BloomFilter.load(bloom_path)
+    except OSError:
+        return load_prohibited_passwords(source)
+    return FilteredBlocklist(index, bloom)
+
+
+def open_substring_index(source, path=None, build=True):
+    """Open the substring automaton for source, rebuilding it if it is missing or stale.
+
+    Match lowercased text against it; labels are ranks in the list. Falls
+    back to an in-memory automaton if the file cannot be written, and to an
+    empty one if the source list does not exist. With build=False a missing
+    or stale automaton is not rebuilt here (it takes seconds and a few
+    hundred MB) and None is returned instead.
+    """
+    path = path or substring_path_for(source)
+    try:
+        source_mtime = os.path.getmtime(source)
+    except OSError:
+        source_mtime = None
+        if not os.path.exists(path):
+            print(f"Warning: '{source}' not found.")
+            return AhoCorasick(())
+    try:
+        if _is_stale(path, source_mtime):
+            if not build:
+                return None
+            compile_substring_index(source, path)
+        return MappedAhoCorasick(path)
+    except OSError:
+        return _substring_automaton(source)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compile a prohibited-password list into a binary index.")
+    parser.add_argument("source", help="text file with one password per line")
+    parser.add_argument("dest", nargs="?", help="index file to write (default: SOURCE with .idx)")
+    parser.add_argument("--bloom", type=float, metavar="FP_RATE",
+                        help="also build a Bloom filter with this false-positive rate")
+    parser.add_argument("--canonical", action="store_true",
+                        help="also build the canonical-form index (SOURCE with .canon.idx)")
+    parser.add_argument("--substrings", action="store_true",
+                        help="also build the substring automaton (SOURCE with .ac)")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    dest = compile_blocklist(args.source, args.dest)
+    with BlocklistIndex(dest) as index:
+        print(f"Wrote {len(index)} entries ({os.path.getsize(dest)} bytes) to {dest} "
+              f"in {time.perf_counter() - start:.2f}s")
+        if args.bloom:
+            start = time.perf_counter()
+            path = build_bloom(index, args.bloom, bloom_path_for(args.source))
+            print(f"Wrote Bloom filter ({os.path.getsize(path)} bytes) to {path} "
+                  f"in {time.perf_counter() - start:.2f}s")
+    if args.canonical:
+        start = time.perf_counter()
+        path = compile_canonical_index(args.source, canonical_path_for(args.source))
+        with BlocklistIndex(path) as canonical:
+            print(f"Wrote {len(canonical)} canonical forms ({os.path.getsize(path)} bytes) to {path} "
+                  f"in {time.perf_counter() - start:.2f}s")
+    if args.substrings:
+        start = time.perf_counter()
+        path = compile_substring_index(args.source, substring_path_for(args.source))
+        with MappedAhoCorasick(path) as automaton:
+            stats = automaton.stats()
+        print(f"Wrote substring automaton ({stats['patterns']} patterns, {stats['states']} states, "
+              f"{stats['file_bytes']} bytes) to {path} in {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
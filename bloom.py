@@ -0,0 +1,118 @@
+"""Bloom filter used in front of the exact prohibited-password index.
+
+A negative answer from the filter is definite, so most lookups for passwords
+that are not on the list never touch the exact index. Positive answers are
+confirmed against the exact index by the caller.
+
+File layout (little-endian):
+
+    magic    b"PWBLOOM2"
+    bits     uint64 number of bits in the filter
+    hashes   uint32 number of hash functions
+    capacity uint64 number of entries the filter was sized for
+    fp_rate  float64 false-positive rate it was sized for
+    data     the bit array, bits // 8 rounded up
+
+The sizing parameters are kept so that a saved filter can be checked
+against the ones a caller asks for.
+"""
+import hashlib
+import math
+import mmap
+import struct
+
+MAGIC = b"PWBLOOM2"
+_HEADER = struct.Struct("<QIQd")
+_HEADER_SIZE = len(MAGIC) + _HEADER.size
+
+
+def optimal_parameters(capacity, fp_rate):
+    """Return (bits, hashes) for capacity entries at the given false-positive rate."""
+    if not 0 < fp_rate < 1:
+        raise ValueError("fp_rate must be between 0 and 1")
+    capacity = max(capacity, 1)
+    bits = math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+def _hash_pair(key):
+    digest = hashlib.blake2b(key, digest_size=16).digest()
+    return int.from_bytes(digest[:8], "little"), int.from_bytes(digest[8:], "little") | 1
+
+
+class BloomFilter:
+    """Bit-array Bloom filter over UTF-8 encoded keys, using double hashing."""
+
+    def __init__(self, bits, hashes, data=None, capacity=0, fp_rate=0.0):
+        self.bits = bits
+        self.hashes = hashes
+        self.capacity = capacity  # what the filter was sized for, if known
+        self.fp_rate = fp_rate
+        self._data = bytearray((bits + 7) // 8) if data is None else data
+        self._offset = 0
+        self._map = None
+
+    @classmethod
+    def for_capacity(cls, capacity, fp_rate):
+        return cls(*optimal_parameters(capacity, fp_rate), capacity=capacity, fp_rate=fp_rate)
+
+    @classmethod
+    def build(cls, keys, fp_rate):
+        """Build a filter sized for the given list of byte-string keys."""
+        keys = list(keys)
+        bloom = cls.for_capacity(len(keys), fp_rate)
+        for key in keys:
+            bloom.add(key)
+        return bloom
+
+    def _positions(self, key):
+        h1, h2 = _hash_pair(key)
+        bits = self.bits
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % bits
+
+    def add(self, key):
+        data = self._data
+        for pos in self._positions(key):
+            data[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, key):
+        data = self._data
+        offset = self._offset
+        for pos in self._positions(key):
+            if not data[offset + (pos >> 3)] >> (pos & 7) & 1:
+                return False
+        return True
+
+    @property
+    def size_bytes(self):
+        return (self.bits + 7) // 8
+
+    def expected_fp_rate(self, entries):
+        """Theoretical false-positive rate after inserting entries keys."""
+        return (1 - math.exp(-self.hashes * entries / self.bits)) ** self.hashes
+
+    def save(self, path):
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(_HEADER.pack(self.bits, self.hashes, self.capacity, self.fp_rate))
+            file.write(self._data[self._offset:self._offset + self.size_bytes])
+
+    @classmethod
+    def load(cls, path):
+        """Open a saved filter with mmap; the bit array is not copied."""
+        with open(path, "rb") as file:
+            data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if data[:len(MAGIC)] != MAGIC:
+            data.close()
+            raise ValueError(f"'{path}' is not a saved Bloom filter")
+        bits, hashes, capacity, fp_rate = _HEADER.unpack_from(data, len(MAGIC))
+        bloom = cls(bits, hashes, data, capacity, fp_rate)
+        bloom._offset = _HEADER_SIZE
+        bloom._map = data
+        return bloom
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
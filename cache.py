@@ -0,0 +1,97 @@
+"""Bounded LRU cache for evaluation results.
+
+Entries are keyed by an HMAC of the password under a secret generated when
+the cache is created, so the cache never holds plaintext and its keys are
+useless outside this process. Entries expire after ttl seconds.
+
+Pass maxsize=0 to turn the cache off; every lookup is then a miss.
+"""
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class EvaluationCache:
+    """Thread-safe LRU + TTL cache with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=4096, ttl=300.0, clock=time.monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._secret = secrets.token_bytes(32)
+        self._entries = OrderedDict()  # key -> (expires_at, value), oldest first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def enabled(self):
+        return self.maxsize > 0
+
+    def key(self, password):
+        return hmac.digest(self._secret, password.encode("utf-8", "surrogatepass"), hashlib.sha256)
+
+    def get(self, password, default=None):
+        if not self.enabled:
+            self.misses += 1
+            return default
+        key = self.key(password)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            if entry[0] <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, password, value):
+        if not self.enabled:
+            return
+        key = self.key(password)
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, password, compute):
+        """Return the cached value for password, calling compute(password) on a miss."""
+        value = self.get(password, _MISSING)
+        if value is _MISSING:
+            value = compute(password)
+            self.put(password, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
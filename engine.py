@@ -0,0 +1,479 @@
+"""Headless password scoring engine.
+
+Everything the checker needs to score a password lives here, with no GUI
+imports, so it can be used from workers, services and scripts. The Tk app in
+test.py is a thin layer on top of this module.
+"""
+import json
+import operator
+import os
+import re
+import string
+from collections import namedtuple
+from itertools import repeat
+
+import guesses
+import keyboard
+from blocklist import open_blocklist, open_substring_index
+from repetition import predictable_characters
+
+PROHIBITED_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prohibited.txt")
+
+# Stable result of evaluate(); fields are only ever added at the end.
+Evaluation = namedtuple("Evaluation", [
+    "score",             # total score out of 100
+    "label",             # strength_label(score)
+    "length_score",      # 0-10
+    "variety_score",     # 0-10
+    "sequence_penalty",  # 0-10
+    "prohibited",        # True if the password is on the blocklist
+])
+
+# --- Load prohibited passwords ---
+_default_prohibited = None
+
+def default_prohibited_passwords():
+    """Return the bundled blocklist, opening its compiled index on first use only."""
+    global _default_prohibited
+    if _default_prohibited is None:
+        _default_prohibited = open_blocklist(PROHIBITED_FILE)
+    return _default_prohibited
+
+_default_normalized = None
+
+def default_normalized_blocklist():
+    """Return the bundled blocklist extended to leet, case and affix variants (see normalize.py)."""
+    global _default_normalized
+    if _default_normalized is None:
+        _default_normalized = open_blocklist(PROHIBITED_FILE, normalized=True)
+    return _default_normalized
+
+_default_substrings = None
+
+def default_substring_index(build=True):
+    """Return the substring automaton for the bundled blocklist, building it on first use only.
+
+    With build=False, return None rather than build a missing or stale automaton.
+    """
+    global _default_substrings
+    if _default_substrings is None:
+        _default_substrings = open_substring_index(PROHIBITED_FILE, build=build)
+    return _default_substrings
+
+# --- Character-class profile ---
+LOWER = 1
+UPPER = 2
+DIGIT = 4
+SYMBOL = 8
+
+_TYPES_USED = [bin(mask).count("1") for mask in range(16)]
+
+def _mask_from_counts(counts):
+    mask = 0
+    for bits, count in enumerate(counts):
+        if count:
+            mask |= bits
+    return mask
+
+def _classify(c):
+    """Return the class bits of one character: every class it belongs to, OR-ed together.
+
+    Some characters are in more than one (U+0345 and the circled letters are
+    cased but not alphanumeric); some, like letters without case, are in none.
+    """
+    return ((c.islower() and LOWER) | (c.isupper() and UPPER)
+            | (c.isdigit() and DIGIT) | ((not c.isalnum()) and SYMBOL))
+
+# Grows as new characters are seen; ASCII is filled in up front.
+_CHAR_CLASS = {chr(i): _classify(chr(i)) for i in range(128)}
+
+class PasswordProfile:
+    """Everything the scorers need to know about a password, built in one pass."""
+    __slots__ = ("password", "length", "lowered", "mask", "counts", "sequence_hits")
+
+    def __init__(self, password):
+        char_class = _CHAR_CLASS
+        counts = [0] * 16  # characters per combination of class bits
+        for c in password:
+            bits = char_class.get(c)
+            if bits is None:
+                bits = char_class[c] = _classify(c)
+            counts[bits] += 1
+        self.password = password
+        self.length = len(password)
+        self.lowered = password.lower()
+        self.counts = counts
+        self.mask = _mask_from_counts(counts)
+        self.sequence_hits = None  # filled in by score_keyboard_sequence
+
+    @property
+    def types_used(self):
+        return _TYPES_USED[self.mask]
+
+def profile(password):
+    """Return a PasswordProfile, passing existing profiles through unchanged."""
+    if isinstance(password, PasswordProfile):
+        return password
+    return PasswordProfile(password)
+
+class IncrementalScorer:
+    """Builds profiles for successive edits of one password.
+
+    Keeps the class counts of the last password, so appending or deleting
+    characters at the end only processes the characters that changed.
+    Sequence hits are left to score_keyboard_sequence, whose walk search is
+    a single pass anyway. Non-ASCII input falls back to a full rebuild.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._password = ""
+        self._counts = [0] * 16
+
+    def profile(self, password):
+        if not password.isascii():
+            self.reset()
+            return PasswordProfile(password)
+
+        previous = self._password
+        keep = 0
+        for a, b in zip(previous, password):
+            if a != b:
+                break
+            keep += 1
+
+        char_class = _CHAR_CLASS
+        counts = self._counts
+        for c in previous[keep:]:
+            counts[char_class[c]] -= 1
+        for c in password[keep:]:
+            counts[char_class[c]] += 1
+        self._password = password
+
+        p = PasswordProfile.__new__(PasswordProfile)
+        p.password = password
+        p.length = len(password)
+        p.lowered = password.lower()
+        p.counts = list(counts)
+        p.mask = _mask_from_counts(counts)
+        p.sequence_hits = None
+        return p
+
+# --- Scoring Functions ---
+# Each scorer accepts a password string or a PasswordProfile.
+def score_length(password):
+    """Calculate the length score out of 100 with additional penalties for very short passwords."""
+    length = profile(password).length
+    base_score = min(length * 5, 100)  # Scale length to a maximum of 100
+    if length < 6:  # Penalize very short passwords
+        base_score -= (6 - length) * 10  # Subtract 10 points for each missing character below 6
+    return max(base_score, 0)  # Ensure score is not negative
+
+def score_variety(password):
+    """Calculate the variety score out of 100 with penalties for overly simple passwords."""
+    p = profile(password)
+    types_used = p.types_used
+    base_score = {1: 25, 2: 50, 3: 75, 4: 100}.get(types_used, 0)  # Scale variety to a maximum of 100
+    if types_used == 1 and p.length <= 6:  # Penalize overly simple passwords
+        base_score -= 20
+    return max(base_score, 0)  # Ensure score is not negative
+
+# The sequence penalty comes from keyboard walks (keyboard.py) on every
+# layout, plus runs of the alphabet ("abcd") and a few common words. Shifted
+# characters count as their keys, so "qweRTY" is one walk. A walk scores a
+# hit for every key after the second, less SEQUENCE_TURN_COST for every turn
+# after the first, so "qwerty" scores 4, "1qaz" 2 and the turning "qwsdf" 2.
+# How many keys it takes to count depends on its shape: SEQUENCE_MIN_ROW
+# straight forward along a row ("123", "abc", "qwe"), SEQUENCE_MIN_WALK for
+# any other straight walk ("1qaz", "zaq1", "7410") and SEQUENCE_MIN_TURNING
+# for one that turns; shorter ones turn up in random strings by chance.
+# Years are not walks: a walk never doubles back, so "2020" and "1212" are
+# repeats rather than walks, and no 19xx or 20xx year is long enough to count.
+# Each layout's walks are added up, the layout with the most hits is used,
+# and every occurrence of one of SEQUENCE_WORDS adds a hit.
+ALPHABET = keyboard.build_graph("alphabet", " ".join(c + c.upper() for c in string.ascii_lowercase),
+                                slanted=False)
+SEQUENCE_GRAPHS = (*keyboard.GRAPHS.values(), ALPHABET)
+SEQUENCE_MIN_ROW = 3
+SEQUENCE_MIN_WALK = 4
+SEQUENCE_MIN_TURNING = 5
+SEQUENCE_TURN_COST = 0.5
+SEQUENCE_WORDS = ("password", "letmein", "admin", "welcome")
+_GRAPHS_BY_NAME = {graph.name: graph for graph in SEQUENCE_GRAPHS}
+
+def walk_hits(walk, text):
+    """Sequence hits for one walk in text; 0 if it is too short for its shape to count."""
+    length = walk.end - walk.start
+    if walk.turns > 1:
+        minimum = SEQUENCE_MIN_TURNING
+    else:
+        graph = _GRAPHS_BY_NAME[walk.graph]
+        along_row = graph.steps.get(text[walk.start:walk.start + 2]) == graph.forward
+        minimum = SEQUENCE_MIN_ROW if along_row else SEQUENCE_MIN_WALK
+    if length < minimum:
+        return 0
+    return int(length - 2 - SEQUENCE_TURN_COST * (walk.turns - 1))
+
+# Every adjacent pair on any of the graphs: "f" if it steps forward along a
+# row on one of them, "+" otherwise. A walk that counts needs two forward
+# steps in a row or SEQUENCE_MIN_WALK - 1 steps of any kind.
+_ANY_STEP = {pair: "+" for graph in SEQUENCE_GRAPHS for pair in graph.steps}
+_ANY_STEP.update({pair: "f" for graph in SEQUENCE_GRAPHS
+                  for pair, direction in graph.steps.items() if direction == graph.forward})
+_MAY_COUNT = re.compile("ff|[f+]{%d}" % (SEQUENCE_MIN_WALK - 1))
+_WORDS = re.compile("|".join(SEQUENCE_WORDS))
+
+def sequence_hits(password):
+    """Sequence hits in the password: its walks' hits on the layout where they add up to most, plus common words."""
+    words = len(_WORDS.findall(password.lower()))
+    if not _MAY_COUNT.search("".join(map(_ANY_STEP.get, map(operator.add, password, password[1:]), repeat(" ")))):
+        return words
+    totals = {}
+    for walk in keyboard.find_walks(password, SEQUENCE_GRAPHS, SEQUENCE_MIN_ROW):
+        totals[walk.graph] = totals.get(walk.graph, 0) + walk_hits(walk, password)
+    return max(totals.values(), default=0) + words
+
+def score_keyboard_sequence(password):
+    """Calculate the penalty for keyboard walks, alphabet runs and common words in the password."""
+    p = profile(password)
+    if p.sequence_hits is None:
+        p.sequence_hits = sequence_hits(p.password)
+    penalty = p.sequence_hits * 10  # Penalize more heavily for common sequences
+    return min(penalty, 100)  # Cap penalty at 100
+
+def has_common_sequence(password):
+    """True if the password contains a keyboard walk, alphabet run or common word that is penalized."""
+    return score_keyboard_sequence(password) > 0
+
+ENTROPY_FULL_BITS = 40  # log2 of the estimated guesses that earns the full entropy score (~1e12)
+
+def estimate_guesses(password, index=None):
+    """Return a guesses.Estimate for the password: how many guesses it would take, and why.
+
+    Dictionary words are ranked by their position in the bundled blocklist
+    unless another substring index is given.
+    """
+    if index is None:
+        index = default_substring_index()
+    return guesses.estimate_guesses(profile(password).password, index)
+
+def score_entropy(password):
+    """Score the guess-count entropy (log2 of estimate_guesses()) out of 100."""
+    return min(round(estimate_guesses(password).bits * 100 / ENTROPY_FULL_BITS), 100)
+
+def score_pattern(password):
+    """Score out of 100: the share of characters no run, repeated block or sequence predicts."""
+    lowered = profile(password).lowered
+    if not lowered:
+        return 0
+    return round(100 * (len(lowered) - predictable_characters(lowered)) / len(lowered))
+
+def score_common(password, prohibited_passwords=None):
+    """0 if the password is empty or on the blocklist (the bundled one by default), otherwise 100."""
+    password = profile(password).password
+    if not password:
+        return 0
+    if prohibited_passwords is None:
+        prohibited_passwords = default_prohibited_passwords()
+    return 0 if password in prohibited_passwords else 100
+
+# --- Scorer registry ---
+# A component turns a profile (and the blocklist, if it lists it as an
+# input) into a value out of 100. It declares its weight in each named
+# scorer; a JSON file named by $PWCHECK_WEIGHTS, shaped like
+# {"total_score": {"length": 0.5}}, overrides them without code changes.
+Component = namedtuple("Component", ["name", "func", "inputs", "weights"])
+COMPONENT_INPUTS = ("profile", "prohibited_passwords")
+WEIGHTS_ENV = "PWCHECK_WEIGHTS"
+COMPONENTS = {}
+_weight_overrides = {}
+_compiled = {}
+
+def register_component(name, func, inputs=("profile",), weights=None):
+    """Add (or replace) a scoring component; weights maps scorer name -> weight."""
+    if tuple(inputs[:1]) != ("profile",) or not set(inputs) <= set(COMPONENT_INPUTS):
+        raise ValueError(f"component inputs must be 'profile' followed by any of {COMPONENT_INPUTS[1:]}")
+    COMPONENTS[name] = Component(name, func, tuple(inputs), dict(weights or {}))
+    _compiled.clear()
+
+def set_weights(overrides):
+    """Replace the configured weights: {scorer name: {component: weight}}."""
+    _weight_overrides.clear()
+    for scorer_name, weights in overrides.items():
+        _weight_overrides[scorer_name] = {name: float(weight) for name, weight in weights.items()}
+    _compiled.clear()
+
+def load_weights(path=None):
+    """Apply weight overrides from a JSON file (by default the one named by $PWCHECK_WEIGHTS)."""
+    path = path or os.environ.get(WEIGHTS_ENV)
+    if path:
+        with open(path, encoding="utf-8") as f:
+            set_weights(json.load(f))
+
+def scorer_weights(scorer_name):
+    """{component: weight} for a scorer: the declared weights with the configured ones on top."""
+    weights = {name: c.weights[scorer_name] for name, c in COMPONENTS.items() if scorer_name in c.weights}
+    weights.update(_weight_overrides.get(scorer_name, {}))
+    unknown = set(weights) - set(COMPONENTS)
+    if unknown:
+        raise ValueError(f"unknown scoring components for {scorer_name}: {', '.join(sorted(unknown))}")
+    return weights
+
+def compile_scorer(weights, report=()):
+    """Compile {component: weight} into one evaluator.
+
+    The evaluator takes (password, prohibited_passwords=None) and returns
+    (total, values): the weighted sum of the components floored at 0, and
+    each component's value in evaluator.components order (the report names
+    first, then the other weighted components in registration order). The
+    password is profiled once and every component reads that profile.
+    """
+    names = list(report) + [name for name in COMPONENTS if weights.get(name) and name not in report]
+    steps = tuple((COMPONENTS[name].func, "prohibited_passwords" in COMPONENTS[name].inputs,
+                   weights.get(name, 0.0)) for name in names)
+
+    def evaluate(password, prohibited_passwords=None):
+        p = profile(password)
+        total = 0.0
+        values = []
+        for func, wants_blocklist, weight in steps:
+            value = func(p, prohibited_passwords) if wants_blocklist else func(p)
+            values.append(value)
+            if weight:
+                total += value * weight
+        return max(total, 0), values
+
+    evaluate.components = tuple(names)
+    evaluate.weights = dict(weights)
+    return evaluate
+
+def scorer(scorer_name, report=()):
+    """The compiled evaluator for a named scorer, rebuilt whenever weights or components change."""
+    key = (scorer_name, tuple(report))
+    evaluate = _compiled.get(key)
+    if evaluate is None:
+        evaluate = _compiled[key] = compile_scorer(scorer_weights(scorer_name), report)
+    return evaluate
+
+register_component("length", score_length, weights={"total_score": 0.4, "final_strength_score": 0.25})
+register_component("variety", score_variety, weights={"total_score": 0.6, "final_strength_score": 0.20})
+register_component("sequence", score_keyboard_sequence, weights={"total_score": -1.0})
+register_component("entropy", score_entropy, weights={"final_strength_score": 0.25})
+register_component("pattern", score_pattern, weights={"final_strength_score": 0.15})
+register_component("common", score_common, inputs=("profile", "prohibited_passwords"),
+                   weights={"final_strength_score": 0.15})
+load_weights()
+
+_TOTAL_REPORT = ("length", "variety", "sequence")
+
+def total_score(password):
+    """Calculate the total score for the password out of 100."""
+    total, values = scorer("total_score", _TOTAL_REPORT)(password)
+    return total, round(values[0] / 10), round(values[1] / 10), round(values[2] / 10)
+
+def strength_label(score):
+    """Update strength labels to reflect adjusted scoring."""
+    if score <= 20: return "Very Weak"
+    elif score <= 40: return "Weak"
+    elif score <= 60: return "Moderate"
+    elif score <= 80: return "Strong"
+    else: return "Very Strong"
+
+# Short or rare entries turn up by chance in random strings (a quarter of
+# random 12-letter passwords contain some 4-letter entry), so only words at
+# least this long and this high in the list count as embedded.
+EMBEDDED_MIN_LENGTH = 5
+EMBEDDED_MAX_RANK = 100000
+
+def embedded_prohibited_words(password, index=None):
+    """(start, end, rank) of every prohibited word inside the password, overlaps included.
+
+    Matching is case-insensitive; offsets are into the lowercased password.
+    index defaults to the substring automaton of the bundled blocklist.
+    Words shorter than EMBEDDED_MIN_LENGTH or ranked past EMBEDDED_MAX_RANK
+    are left out.
+    """
+    if index is None:
+        index = default_substring_index()
+    return [(start, end, rank) for start, end, rank in index.iter_matches(profile(password).lowered)
+            if end - start >= EMBEDDED_MIN_LENGTH and rank < EMBEDDED_MAX_RANK]
+
+def longest_embedded_span(password, index=None):
+    """(start, end) of the longest prohibited word inside the password, or None.
+
+    Offsets are into the lowercased password, as for embedded_prohibited_words.
+    """
+    matches = embedded_prohibited_words(password, index)
+    if not matches:
+        return None
+    start, end, _ = max(matches, key=lambda m: m[1] - m[0])
+    return start, end
+
+def longest_embedded_word(password, index=None):
+    """The longest prohibited word inside the password (lowercased), or None."""
+    p = profile(password)
+    span = longest_embedded_span(p, index)
+    return None if span is None else p.lowered[span[0]:span[1]]
+
+def generate_feedback(password, seq_penalty=None, embedded_word=None):
+    """Generate interactive feedback based on the password's scores.
+
+    Pass seq_penalty (as returned by total_score) to skip recomputing it,
+    and embedded_word (from longest_embedded_word) to warn about it.
+    """
+    p = profile(password)
+    mask = p.mask
+    if seq_penalty is None:
+        seq_penalty = score_keyboard_sequence(p)
+    pros = []
+    cons = []
+
+    # Pros
+    if p.length >= 12:
+        pros.append("✅ Your password is long enough for strong security.")
+    if mask & LOWER:
+        pros.append("✅ Includes lowercase letters.")
+    if mask & UPPER:
+        pros.append("✅ Includes uppercase letters.")
+    if mask & DIGIT:
+        pros.append("✅ Includes numbers.")
+    if mask & SYMBOL:
+        pros.append("✅ Includes special characters.")
+
+    # Cons
+    if p.length < 12:
+        cons.append("🔑 Consider making your password longer (at least 12 characters).")
+    if not mask & LOWER:
+        cons.append("🔑 Add lowercase letters for better variety.")
+    if not mask & UPPER:
+        cons.append("🔑 Add uppercase letters for better variety.")
+    if not mask & DIGIT:
+        cons.append("🔑 Add numbers to strengthen your password.")
+    if not mask & SYMBOL:
+        cons.append("🔑 Add special characters like '!@#$%^&*' for enhanced security.")
+    if seq_penalty > 0:
+        cons.append("⚠️ Avoid sequences like '123', 'abc', keyboard walks like 'qwerty', or words like 'password'.")
+    if embedded_word:
+        cons.append(f"⚠️ Contains the common password '{embedded_word}'.")
+
+    # Combine feedback
+    feedback = ["Pros:"] + pros
+    if cons:
+        feedback += ["\nCons:"] + cons
+    return feedback
+
+# --- Evaluation ---
+def evaluate(password, prohibited_passwords=None):
+    """Score a password and return an Evaluation.
+
+    prohibited_passwords is any container supporting ``in``; the bundled
+    blocklist is loaded lazily when it is not given.
+    """
+    if prohibited_passwords is None:
+        prohibited_passwords = default_prohibited_passwords()
+    if password in prohibited_passwords:
+        return Evaluation(0, strength_label(0), 0, 0, 0, True)
+    score, len_score, var_score, seq_penalty = total_score(profile(password))
+    return Evaluation(score, strength_label(score), len_score, var_score, seq_penalty, False)
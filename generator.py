@@ -0,0 +1,234 @@
+"""Constructive password generator.
+
+Builds passwords that meet the Easy/Medium/Hard rules directly instead of
+drawing random candidates and rejecting them:
+
+* the character classes each mode requires are laid out first, so the
+  variety rule always holds and the score is known before any character
+  is drawn (an impossible mode/length pair is reported up front);
+* characters are drawn left to right with ``secrets`` while the keyboard
+  walk each one ends is tracked on every one of engine's sequence graphs,
+  and any character that would make a walk long enough to be penalized is
+  excluded;
+* the last character is re-drawn if it would complete a prohibited password;
+* a password that spells one of engine.SEQUENCE_WORDS is started over.
+
+A call normally finishes in one pass over the password. If some position
+has no character left to draw, the password is started over with a fresh
+layout; --bench reports how often that and the last-character re-draws
+happened.
+
+    python generator.py --mode Hard --length 16 --count 5
+    python generator.py --bench
+"""
+import argparse
+import secrets
+import string
+import time
+from collections import Counter, namedtuple
+
+import engine
+
+SYMBOLS = "!@#$%^&*()-_=+[]{}|;:,.<>?"
+
+CLASS_CHARS = {
+    engine.LOWER: string.ascii_lowercase,
+    engine.UPPER: string.ascii_uppercase,
+    engine.DIGIT: string.digits,
+    engine.SYMBOL: SYMBOLS,
+}
+_REPRESENTATIVE = {engine.LOWER: "a", engine.UPPER: "A", engine.DIGIT: "1", engine.SYMBOL: "!"}
+
+# required(length) -> {class bit: minimum count}; the rest is drawn from charset
+Mode = namedtuple("Mode", ["charset_classes", "min_types", "min_score", "required"])
+
+MODES = {
+    "Easy": Mode((engine.LOWER,), 1, 20,
+                 lambda length: {engine.LOWER: length}),
+    "Medium": Mode((engine.LOWER, engine.UPPER, engine.DIGIT), 2, 40,
+                   lambda length: {engine.LOWER: max(1, length // 3),
+                                   engine.UPPER: max(1, length // 4),
+                                   engine.DIGIT: max(1, length // 4)}),
+    "Hard": Mode((engine.LOWER, engine.UPPER, engine.DIGIT, engine.SYMBOL), 4, 60,
+                 lambda length: {engine.LOWER: 2, engine.UPPER: 2, engine.DIGIT: 2, engine.SYMBOL: 2}),
+}
+
+_rng = secrets.SystemRandom()
+_allowed_cache = {}  # (walk state, pool) -> characters that complete no penalized walk
+_START = (None, ())  # the walk state before the first character
+
+
+def _advance(state, c):
+    """The walk state after c: c itself and, per sequence graph, the walk c ends.
+
+    A walk is (keys, direction of its last step, whether every step went
+    that way), following keyboard.KeyboardGraph.walks(): a step straight back
+    starts a new walk but is remembered, so the step after it can be too.
+    """
+    previous, walks = state
+    if previous is None:
+        return c, ((1, None, True),) * len(engine.SEQUENCE_GRAPHS)
+    pair = previous + c
+    advanced = []
+    for (length, last, straight), graph in zip(walks, engine.SEQUENCE_GRAPHS):
+        direction = graph.steps.get(pair)
+        if direction is None:
+            advanced.append((1, None, True))
+        elif last is not None and direction == graph.opposites[last]:
+            advanced.append((1, direction, True))
+        else:
+            advanced.append((length + 1, direction, length == 1 or (straight and direction == last)))
+    return c, tuple(advanced)
+
+
+def _penalized(walks):
+    """True if one of the walks is long enough for its shape to score (see engine.walk_hits)."""
+    for (length, direction, straight), graph in zip(walks, engine.SEQUENCE_GRAPHS):
+        if not straight:
+            minimum = engine.SEQUENCE_MIN_TURNING
+        elif direction == graph.forward:
+            minimum = engine.SEQUENCE_MIN_ROW
+        else:
+            minimum = engine.SEQUENCE_MIN_WALK
+        if length >= minimum:
+            return True
+    return False
+
+
+def _allowed(state, pool):
+    allowed = _allowed_cache.get((state, pool))
+    if allowed is None:
+        allowed = [c for c in pool if not _penalized(_advance(state, c)[1])]
+        _allowed_cache[(state, pool)] = allowed
+    return allowed
+
+
+def required_classes(mode, length):
+    """{class bit: minimum count} for mode, shrunk (never below one each) to fit length."""
+    required = MODES[mode].required(length)
+    while sum(required.values()) > length:
+        largest = max(required, key=required.get)
+        if required[largest] <= 1:
+            raise ValueError(f"a password of length {length} cannot hold {len(required)} character types")
+        required[largest] -= 1
+    return required
+
+
+def plan(mode, length):
+    """Return the class bit of every position for mode and length.
+
+    Raises ValueError if no password of that mode and length can reach the
+    mode's minimum score.
+    """
+    settings = MODES[mode]
+    required = required_classes(mode, length)
+    layout = [bit for bit, count in required.items() for _ in range(count)]
+    layout += [0] * (length - len(layout))  # 0: any class the mode allows
+    _rng.shuffle(layout)
+
+    # Without sequences the score only depends on length and classes, and the
+    # free positions can only add classes, so a stand-in with just the
+    # required classes gives the lowest score this layout can produce.
+    stand_in = "".join(_REPRESENTATIVE[bit] for bit in required).ljust(length, "a")
+    score, *_ = engine.total_score(stand_in)
+    if score < settings.min_score or engine.profile(stand_in).types_used < settings.min_types:
+        raise ValueError(f"{mode} passwords of length {length} cannot reach a score of {settings.min_score}")
+    return layout
+
+
+MAX_ATTEMPTS = 100  # fresh layouts tried before giving up on a password
+
+
+def generate_password(mode="Hard", length=12, prohibited_passwords=(), stats=None):
+    """Generate one password for mode ("Easy", "Medium" or "Hard") and length.
+
+    If given, stats is a Counter that receives "redraws", the number of
+    times a last character was re-drawn to avoid the prohibited list, and
+    "retries", the number of times the password was started over with a
+    fresh layout because some position had no character left to draw (or
+    the password spelled a common word).
+    """
+    settings = MODES[mode]
+    any_chars = "".join(CLASS_CHARS[bit] for bit in settings.charset_classes)
+    for _ in range(MAX_ATTEMPTS):
+        password = _draw(plan(mode, length), any_chars, prohibited_passwords, stats)
+        if password is not None:
+            return password
+        if stats is not None:
+            stats["retries"] += 1
+    raise ValueError(f"could not generate a {mode} password of length {length} "
+                     f"in {MAX_ATTEMPTS} attempts")
+
+
+def _draw(layout, any_chars, prohibited_passwords, stats):
+    """Draw a password with the given class layout, or None if a position runs out of characters."""
+    last = len(layout) - 1
+    chars = []
+    state = _START
+    for position, bit in enumerate(layout):
+        pool = CLASS_CHARS[bit] if bit else any_chars
+        allowed = _allowed(state, pool)  # nothing that completes a penalized walk
+        if not allowed:
+            return None
+        c = _rng.choice(allowed)
+        if position == last and prohibited_passwords:
+            prefix = "".join(chars)
+            allowed = list(allowed)
+            while prefix + c in prohibited_passwords:
+                allowed.remove(c)
+                if stats is not None:
+                    stats["redraws"] += 1
+                if not allowed:
+                    return None
+                c = _rng.choice(allowed)
+        chars.append(c)
+        state = _advance(state, c)
+    password = "".join(chars)
+    lowered = password.lower()
+    if any(word in lowered for word in engine.SEQUENCE_WORDS):
+        return None
+    return password
+
+
+def benchmark(count, modes=("Easy", "Medium", "Hard"), length=12):
+    """Time count generations per mode against the bundled blocklist, with their retries and redraws."""
+    blocklist = engine.default_prohibited_passwords()
+    for mode in modes:
+        totals = Counter()
+        worst = Counter()
+        start = time.perf_counter()
+        for _ in range(count):
+            stats = Counter()
+            password = generate_password(mode, length, blocklist, stats)
+            score, *_ = engine.total_score(password)
+            assert score >= MODES[mode].min_score and password not in blocklist
+            totals.update(stats)
+            for key, n in stats.items():
+                worst[key] = max(worst[key], n)
+        elapsed = time.perf_counter() - start
+        print(f"{mode:<6} length {length}: {count / elapsed:,.0f} passwords/s, "
+              f"retries {totals['retries']} (at most {worst['retries']} per password), "
+              f"last-character redraws {totals['redraws']} (at most {worst['redraws']} per password)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate passwords for the Easy/Medium/Hard modes.")
+    parser.add_argument("--mode", choices=sorted(MODES), default="Hard")
+    parser.add_argument("--length", type=int, default=12)
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--bench", action="store_true", help="benchmark every mode instead")
+    args = parser.parse_args(argv)
+
+    if args.bench:
+        benchmark(args.count if args.count > 1 else 20_000, length=args.length)
+        return
+    blocklist = engine.default_prohibited_passwords()
+    try:
+        for _ in range(args.count):
+            print(generate_password(args.mode, args.length, blocklist))
+    except ValueError as exc:
+        parser.error(str(exc))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,291 @@
+"""Guess-count strength estimator.
+
+Estimates how many guesses an attacker who tries common passwords and
+patterns first would need, in the manner of zxcvbn. The password is covered
+by matches of five kinds, and the cheapest cover wins:
+
+* "dictionary": a prohibited.txt entry, guessed in list order, so its
+  guesses are its rank (its position among the distinct lowercased
+  entries). Capitalisation, leet substitutions and reversal multiply that.
+  The ranked list is the precompiled substring automaton from blocklist.py,
+  so matching is one mapped pass over the password.
+* "keyboard": a walk over adjacent keys ("qwerty", "1qaz", "zaq1") on one
+  of keyboard.py's layouts, costed by its length, turns and shifts.
+* "sequence", "repeat": arithmetic sequences, runs and repeated blocks
+  found by repetition.py; a repeated block costs its own estimate times
+  the number of copies.
+* "date", "year": digit dates such as "12/05/1990" or "120590", and years.
+
+Whatever is not covered is a "bruteforce" segment at 10 guesses per
+character. A cover of l matches with guesses g1..gl costs
+l! * g1 * ... * gl + MIN_GUESSES_BEFORE_GROWING ** (l - 1): the attacker
+also has to guess how the pieces are ordered, and every extra piece costs
+at least as much as a short brute force. The minimum over all covers is
+found with a dynamic program over end positions and cover lengths, in
+log10 so that long passwords do not overflow.
+"""
+import math
+import re
+import time
+from collections import namedtuple
+
+from keyboard import GRAPHS, find_walks
+from repetition import find_patterns
+
+BRUTEFORCE_CARDINALITY = 10
+MIN_GUESSES_BEFORE_GROWING = 10000
+MIN_SUBMATCH_GUESSES_SINGLE_CHAR = 10
+MIN_SUBMATCH_GUESSES_MULTI_CHAR = 50
+MIN_YEAR_SPACE = 20
+REFERENCE_YEAR = time.localtime().tm_year
+
+# token is password[start:end]; detail holds what the guesses were derived
+# from (rank, word, period, ...), for explaining the result.
+Match = namedtuple("Match", ["kind", "start", "end", "token", "guesses", "detail"])
+# guesses is 10 ** log10 (inf past float range); sequence is the winning cover.
+Estimate = namedtuple("Estimate", ["guesses", "log10", "bits", "sequence"])
+
+_LOG10_2 = math.log10(2)
+
+# Substitutions undone before dictionary lookup. As in normalize.py, "l" is
+# kept, because it is usually itself rather than a "1" in disguise.
+_UNLEET = str.maketrans({"@": "a", "4": "a", "8": "b", "3": "e", "9": "g", "1": "i", "!": "i",
+                         "0": "o", "$": "s", "5": "s", "7": "t", "+": "t"})
+
+_DIGITS = re.compile(r"\d{4,}")
+_SEPARATED_DATE = re.compile(r"(?=(\d{1,4})([\s/\\_.-])(\d{1,2})\2(\d{1,4}))")
+_YEAR = re.compile(r"19\d\d|20\d\d")
+# Where a run of 4-8 digits is cut into three date parts (zxcvbn's splits).
+_DATE_SPLITS = {
+    4: ((1, 2), (2, 3)),
+    5: ((1, 3), (2, 3)),
+    6: ((1, 2), (2, 4), (4, 5)),
+    7: ((1, 3), (2, 3), (4, 5), (4, 6)),
+    8: ((2, 4), (4, 6)),
+}
+
+
+# --- Guess counts per kind ---
+
+def _uppercase_variations(token):
+    if token.islower() or not any(c.isupper() for c in token):
+        return 1
+    if token.isupper() or (token[0].isupper() and token[1:].islower()) or (token[:-1].islower()):
+        return 2
+    upper = sum(c.isupper() for c in token)
+    lower = sum(c.islower() for c in token)
+    return sum(math.comb(upper + lower, i) for i in range(1, min(upper, lower) + 1))
+
+
+def _leet_variations(token, word):
+    """How many ways of substituting the word's letters could have produced token."""
+    variations = 1
+    lowered = token.lower()
+    for subbed, letter in {(s, w) for s, w in zip(lowered, word) if s != w}:
+        s = lowered.count(subbed)
+        u = lowered.count(letter)
+        if not u:
+            variations *= 2
+        else:
+            variations *= sum(math.comb(s + u, i) for i in range(1, min(s, u) + 1))
+    return variations
+
+
+def _year_space(year):
+    return max(abs(year - REFERENCE_YEAR), MIN_YEAR_SPACE)
+
+
+def _expand_year(year, digits):
+    if digits > 2:
+        return year if 1000 <= year <= 2050 else None
+    return year + (1900 if year > 50 else 2000)
+
+
+def _date_year(parts):
+    """The year of the first (day, month, year) reading of three digit strings, or None."""
+    for year_part, rest in ((parts[2], parts[:2]), (parts[0], parts[1:])):
+        year = _expand_year(int(year_part), len(year_part))
+        if year is None:
+            continue
+        a, b = int(rest[0]), int(rest[1])
+        if (1 <= a <= 31 and 1 <= b <= 12) or (1 <= a <= 12 and 1 <= b <= 31):
+            return year
+    return None
+
+
+# --- Matchers ---
+
+def _dictionary_matches(password, lowered, index):
+    n = len(lowered)
+    matches = []
+    for start, end, rank in index.iter_matches(lowered):
+        token = password[start:end]
+        matches.append(Match("dictionary", start, end, token, (rank + 1) * _uppercase_variations(token),
+                             {"rank": rank + 1, "word": lowered[start:end]}))
+
+    reversed_lowered = lowered[::-1]
+    if reversed_lowered != lowered:
+        for start, end, rank in index.iter_matches(reversed_lowered):
+            start, end = n - end, n - start
+            token = password[start:end]
+            word = reversed_lowered[n - end:n - start]
+            if word != word[::-1]:
+                matches.append(Match("dictionary", start, end, token,
+                                     (rank + 1) * _uppercase_variations(token) * 2,
+                                     {"rank": rank + 1, "word": word, "reversed": True}))
+
+    unleeted = lowered.translate(_UNLEET)
+    if unleeted != lowered:
+        for start, end, rank in index.iter_matches(unleeted):
+            word = unleeted[start:end]
+            if word == lowered[start:end]:
+                continue  # no substitution inside, already matched above
+            token = password[start:end]
+            matches.append(Match("dictionary", start, end, token,
+                                 (rank + 1) * _uppercase_variations(token) * _leet_variations(token, word),
+                                 {"rank": rank + 1, "word": word, "l33t": True}))
+    return matches
+
+
+def _keyboard_matches(password):
+    return [Match("keyboard", walk.start, walk.end, password[walk.start:walk.end], GRAPHS[walk.graph].guesses(walk),
+                  {"graph": walk.graph, "turns": walk.turns, "shifted": walk.shifted})
+            for walk in find_walks(password)]
+
+
+def _pattern_matches(password, lowered, index):
+    matches = []
+    for pattern in find_patterns(lowered):
+        start, end, period = pattern.start, pattern.end, pattern.period
+        token = password[start:end]
+        if pattern.kind == "sequence":
+            first = token[0]
+            base = 4 if first in "aAzZ019" else 10 if first.isdigit() else 26
+            if ord(token[1]) < ord(first):
+                base *= 2
+            matches.append(Match("sequence", start, end, token, base * len(token), {}))
+        else:
+            block = token[:period]
+            base = estimate_guesses(block, index).guesses if period > 1 else BRUTEFORCE_CARDINALITY
+            matches.append(Match("repeat", start, end, token, base * (end - start) / period,
+                                 {"block": block, "repeats": (end - start) / period}))
+    return matches
+
+
+def _date_matches(password):
+    matches = []
+    for run in _DIGITS.finditer(password):
+        digits = run.group()
+        for i in range(len(digits) - 3):
+            for j in range(i + 4, min(i + 8, len(digits)) + 1):
+                token = digits[i:j]
+                for k, l in _DATE_SPLITS[len(token)]:
+                    year = _date_year((token[:k], token[k:l], token[l:]))
+                    if year is not None:
+                        start = run.start() + i
+                        matches.append(Match("date", start, start + len(token), token,
+                                             365 * _year_space(year), {"year": year}))
+                        break
+    for date in _SEPARATED_DATE.finditer(password):
+        year = _date_year((date.group(1), date.group(3), date.group(4)))
+        if year is not None:
+            start = date.start()
+            end = start + len(date.group(1)) + len(date.group(3)) + len(date.group(4)) + 2
+            matches.append(Match("date", start, end, password[start:end],
+                                 365 * _year_space(year) * 4, {"year": year, "separator": date.group(2)}))
+    for year in _YEAR.finditer(password):
+        matches.append(Match("year", year.start(), year.end(), year.group(),
+                             _year_space(int(year.group())), {}))
+    return matches
+
+
+def find_matches(password, index):
+    """Every non-brute-force Match in password; index is the ranked substring automaton
+    (engine.default_substring_index() for the bundled list)."""
+    lowered = password.lower()
+    if len(lowered) != len(password):
+        password = lowered  # offsets must line up; case is lost for such rare text
+    return (_dictionary_matches(password, lowered, index) + _keyboard_matches(password)
+            + _pattern_matches(password, lowered, index) + _date_matches(password))
+
+
+# --- Most guessable cover ---
+
+_LOG10_GROWING = math.log10(MIN_GUESSES_BEFORE_GROWING)
+_LN10 = math.log(10)
+
+
+def _log10_guesses(match):
+    floor = MIN_SUBMATCH_GUESSES_SINGLE_CHAR if match.end - match.start == 1 else MIN_SUBMATCH_GUESSES_MULTI_CHAR
+    return math.log10(max(match.guesses, floor))
+
+
+def _log10_total(length, log10_product):
+    """log10 of length! * product + MIN_GUESSES_BEFORE_GROWING ** (length - 1)."""
+    a = math.lgamma(length + 1) / _LN10 + log10_product
+    b = _LOG10_GROWING * (length - 1)
+    if a < b:
+        a, b = b, a
+    return a + math.log10(1 + 10 ** (b - a))
+
+
+def _consider(covers, length, log10_product, match, previous_length):
+    """Add a cover of password[:k] to covers ({length: (product, total, last match, length - 1)})
+    unless one with no more matches is at least as cheap, dropping those it beats."""
+    total = _log10_total(length, log10_product)
+    for other_length, (_, other_total, _, _) in covers.items():
+        if other_length <= length and other_total <= total:
+            return
+    for other_length in [l for l, cover in covers.items() if l >= length and cover[1] >= total]:
+        del covers[other_length]
+    covers[length] = (log10_product, total, match, previous_length)
+
+
+def estimate_guesses(password, index):
+    """Return an Estimate: guesses, log10 and bits of the cheapest cover, and the cover itself."""
+    if not password:
+        return Estimate(1, 0.0, 0.0, [])
+    matches = find_matches(password, index)
+    if len(password.lower()) != len(password):
+        password = password.lower()
+    n = len(password)
+
+    # Only the cheapest match over each span can be part of the cheapest cover.
+    by_end = [{} for _ in range(n + 1)]
+    for match in matches:
+        log10_guesses = _log10_guesses(match)
+        spans = by_end[match.end]
+        if match.start not in spans or log10_guesses < spans[match.start][0]:
+            spans[match.start] = (log10_guesses, match)
+
+    # A brute-force segment costs BRUTEFORCE_CARDINALITY per character (above
+    # the submatch floors from two characters on), so instead of trying every
+    # segment the covers of password[:k - 1] are extended by one character:
+    # either their final segment grows or a new one starts.
+    step = math.log10(BRUTEFORCE_CARDINALITY)
+    best = [{} for _ in range(n + 1)]  # best[k]: the covers of password[:k] worth extending
+    best[0][0] = (0.0, 0.0, None, None)
+    for k in range(1, n + 1):
+        covers = best[k]
+        for length, (product, _, last, previous_length) in list(best[k - 1].items()):
+            if last is not None and last.kind == "bruteforce":
+                segment = Match("bruteforce", last.start, k, password[last.start:k],
+                                BRUTEFORCE_CARDINALITY ** (k - last.start), {})
+                _consider(covers, length, product + step, segment, previous_length)
+            else:
+                segment = Match("bruteforce", k - 1, k, password[k - 1], BRUTEFORCE_CARDINALITY, {})
+                _consider(covers, length + 1, product + step, segment, length)
+        for start, (log10_guesses, match) in by_end[k].items():
+            for length, (product, _, _, _) in list(best[start].items()):
+                _consider(covers, length + 1, product + log10_guesses, match, length)
+
+    length, (_, log10, _, _) = min(best[n].items(), key=lambda item: item[1][1])
+    sequence = []
+    k = n
+    while length:
+        _, _, match, previous_length = best[k][length]
+        sequence.append(match)
+        k, length = match.start, previous_length
+    sequence.reverse()
+    guesses = 10 ** log10 if log10 < 300 else math.inf
+    return Estimate(guesses, log10, log10 / _LOG10_2, sequence)
@@ -0,0 +1,433 @@
+"""Hash-only audit against the prohibited-password list.
+
+When only password hashes are available, the list is hashed instead: every
+entry's SHA-1 or NTLM digest goes into a sorted, fixed-width digest index
+that is memory-mapped like the blocklist index, and a file of target hashes
+(one hex digest per line) is checked against it.
+
+    python hash_audit.py hashes.txt --algorithm ntlm -o matches.jsonl
+    python hash_audit.py pwdump.txt --algorithm ntlm --field 3
+    python hash_audit.py --build --algorithm sha1      # build ahead of time
+
+SHA-1 is taken over the UTF-8 entry, NTLM is MD4 over UTF-16LE. Index
+layout (all integers little-endian uint32):
+
+    magic       b"PWHASHX1"
+    algorithm   8 bytes, NUL padded
+    width       digest size in bytes
+    count       number of digests
+    filter[2**21]   bitmap of the 24-bit prefixes present (bytes)
+    buckets[65537]  first digest with each 16-bit prefix, plus count
+    digests[count]  sorted, width bytes each
+    entries[count]  position of each digest's password in the compiled
+                    blocklist index (blocklist.BlocklistIndex)
+
+A lookup first tests the digest's 24-bit prefix in the filter, which turns
+away all but about 1% of misses for the bundled list. The rest read two
+bucket bounds and search the few digests between them (about three) with
+one mmap.find. Input files are split into byte ranges that worker
+processes read and check directly, so only matches are sent back to the
+parent.
+"""
+import argparse
+import binascii
+import csv
+import hashlib
+import json
+import mmap
+import multiprocessing
+import os
+import struct
+import sys
+import time
+
+try:
+    import numpy as np
+except ImportError:  # the prefix filter is then tested one digest at a time
+    np = None
+
+import engine
+from blocklist import BlocklistIndex, _is_stale, compile_blocklist, index_path_for
+
+MAGIC = b"PWHASHX1"
+_BUCKETS = 1 << 16       # buckets by the first two bytes
+_FILTER_BYTES = 1 << 21  # one bit per 24-bit prefix
+_HEADER = struct.Struct("<8s8sII")
+_UINT32 = struct.Struct("<I")
+SEGMENT_BYTES = 8 << 20  # largest byte range a worker reads at once
+FIELDS = ["line", "hash", "password"]
+
+_MASK = 0xFFFFFFFF
+
+
+def _rotl(x, n):
+    x &= _MASK
+    return ((x << n) | (x >> (32 - n))) & _MASK
+
+
+def _md4(data):
+    """MD4 (RFC 1320), for OpenSSL builds that no longer provide it."""
+    message = data + b"\x80" + b"\x00" * ((55 - len(data)) % 64) + struct.pack("<Q", len(data) * 8)
+    a, b, c, d = 0x67452301, 0xEFCDAB89, 0x98BADCFE, 0x10325476
+    for offset in range(0, len(message), 64):
+        x = struct.unpack_from("<16I", message, offset)
+        aa, bb, cc, dd = a, b, c, d
+        for i in (0, 4, 8, 12):
+            a = _rotl(a + ((b & c) | (~b & d)) + x[i], 3)
+            d = _rotl(d + ((a & b) | (~a & c)) + x[i + 1], 7)
+            c = _rotl(c + ((d & a) | (~d & b)) + x[i + 2], 11)
+            b = _rotl(b + ((c & d) | (~c & a)) + x[i + 3], 19)
+        for i in (0, 1, 2, 3):
+            a = _rotl(a + ((b & c) | (b & d) | (c & d)) + x[i] + 0x5A827999, 3)
+            d = _rotl(d + ((a & b) | (a & c) | (b & c)) + x[i + 4] + 0x5A827999, 5)
+            c = _rotl(c + ((d & a) | (d & b) | (a & b)) + x[i + 8] + 0x5A827999, 9)
+            b = _rotl(b + ((c & d) | (c & a) | (d & a)) + x[i + 12] + 0x5A827999, 13)
+        for i in (0, 2, 1, 3):
+            a = _rotl(a + (b ^ c ^ d) + x[i] + 0x6ED9EBA1, 3)
+            d = _rotl(d + (a ^ b ^ c) + x[i + 8] + 0x6ED9EBA1, 9)
+            c = _rotl(c + (d ^ a ^ b) + x[i + 4] + 0x6ED9EBA1, 11)
+            b = _rotl(b + (c ^ d ^ a) + x[i + 12] + 0x6ED9EBA1, 15)
+        a, b, c, d = (a + aa) & _MASK, (b + bb) & _MASK, (c + cc) & _MASK, (d + dd) & _MASK
+    return struct.pack("<4I", a, b, c, d)
+
+
+try:
+    hashlib.new("md4")
+    _md4_digest = lambda data: hashlib.new("md4", data).digest()
+except ValueError:
+    _md4_digest = _md4
+
+
+def sha1_digest(password):
+    return hashlib.sha1(password.encode("utf-8", "surrogatepass")).digest()
+
+
+def ntlm_digest(password):
+    return _md4_digest(password.encode("utf-16-le", "surrogatepass"))
+
+
+ALGORITHMS = {"sha1": (sha1_digest, 20), "ntlm": (ntlm_digest, 16)}
+
+
+# --- Digest index ---
+
+def digest_path_for(source, algorithm):
+    """Default location of a text blocklist's digest index."""
+    return os.path.splitext(source)[0] + f".{algorithm}"
+
+
+def compile_digest_index(source, algorithm, dest=None, index_path=None):
+    """Hash every entry of source's compiled blocklist index and write the digest index; returns its path."""
+    digest, width = ALGORITHMS[algorithm]
+    dest = dest or digest_path_for(source, algorithm)
+    index_path = index_path or index_path_for(source)
+    if _is_stale(index_path, os.path.getmtime(source)):
+        compile_blocklist(source, index_path)
+    with BlocklistIndex(index_path) as index:
+        records = sorted((digest(entry), position) for position, entry in enumerate(index))
+
+    buckets = [0] * (_BUCKETS + 1)
+    prefixes = bytearray(_FILTER_BYTES)
+    for value, _ in records:
+        buckets[int.from_bytes(value[:2], "big") + 1] += 1
+        prefixes[(value[0] << 13) | (value[1] << 5) | (value[2] >> 3)] |= 1 << (value[2] & 7)
+    for i in range(_BUCKETS):
+        buckets[i + 1] += buckets[i]
+
+    tmp = f"{dest}.tmp{os.getpid()}"
+    with open(tmp, "wb") as file:
+        file.write(_HEADER.pack(MAGIC, algorithm.encode("ascii"), width, len(records)))
+        file.write(prefixes)
+        file.write(struct.pack(f"<{_BUCKETS + 1}I", *buckets))
+        file.write(b"".join(value for value, _ in records))
+        file.write(struct.pack(f"<{len(records)}I", *(position for _, position in records)))
+    os.replace(tmp, dest)  # readers never see a half-written index
+    return dest
+
+
+class DigestIndex:
+    """Read-only, memory-mapped digest index; supports ``in`` for raw digests."""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self._map) < _HEADER.size or self._map[:len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(f"'{path}' is not a digest index")
+        _, algorithm, self.width, self._count = _HEADER.unpack_from(self._map)
+        self.algorithm = algorithm.rstrip(b"\0").decode("ascii")
+        buckets_start = _HEADER.size + _FILTER_BYTES
+        self._digests_start = buckets_start + (_BUCKETS + 1) * _UINT32.size
+        self._entries_start = self._digests_start + self._count * self.width
+        self._buckets = struct.unpack_from(f"<{_BUCKETS + 1}I", self._map, buckets_start)
+        self._filter = memoryview(self._map)[_HEADER.size:buckets_start]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._filter.release()
+        self._map.close()
+
+    def __len__(self):
+        return self._count
+
+    def find(self, digest):
+        """Position of the digest's password in the blocklist index, or -1."""
+        if not self._filter[(digest[0] << 13) | (digest[1] << 5) | (digest[2] >> 3)] >> (digest[2] & 7) & 1:
+            return -1
+        return self._search(digest)
+
+    def find_all(self, digests):
+        """Yield (i, position) for every digests[i] in the index; other widths are skipped."""
+        width = self.width
+        prefixes = self._filter
+        search = self._search
+        for i, digest in enumerate(digests):
+            if len(digest) == width and prefixes[(digest[0] << 13) | (digest[1] << 5) | (digest[2] >> 3)] >> (digest[2] & 7) & 1:
+                position = search(digest)
+                if position >= 0:
+                    yield i, position
+
+    def find_packed(self, digests):
+        """Like find_all() for digests packed back to back in one bytes object.
+
+        With NumPy the prefix filter is tested for the whole batch at once.
+        """
+        width = self.width
+        if np is None:
+            yield from self.find_all([digests[i:i + width] for i in range(0, len(digests), width)])
+            return
+        rows = np.frombuffer(digests, dtype=np.uint8).reshape(-1, width)
+        prefixes = (rows[:, 0].astype(np.int64) << 16) | (rows[:, 1].astype(np.int64) << 8) | rows[:, 2]
+        present = (np.frombuffer(self._filter, dtype=np.uint8)[prefixes >> 3] >> (prefixes & 7)) & 1
+        for i in np.flatnonzero(present).tolist():
+            position = self._search(digests[i * width:(i + 1) * width])
+            if position >= 0:
+                yield i, position
+
+    def _search(self, digest):
+        bucket = (digest[0] << 8) | digest[1]
+        lo = self._buckets[bucket]
+        hi = self._buckets[bucket + 1]
+        if lo == hi:
+            return -1
+        width = self.width
+        base = self._digests_start
+        start = base + lo * width
+        end = base + hi * width
+        while True:
+            at = self._map.find(digest, start, end)
+            if at < 0:
+                return -1
+            record, misaligned = divmod(at - base, width)
+            if not misaligned:
+                return _UINT32.unpack_from(self._map, self._entries_start + record * _UINT32.size)[0]
+            start = at + 1
+
+    def __contains__(self, digest):
+        return len(digest) == self.width and self.find(digest) >= 0
+
+    def stats(self):
+        return {
+            "algorithm": self.algorithm,
+            "digests": self._count,
+            "index_bytes": len(self._map),
+            "path": self.path,
+        }
+
+
+def open_digest_index(source, algorithm, path=None, index_path=None):
+    """Open the digest index for source, rebuilding it if it is missing or stale."""
+    path = path or digest_path_for(source, algorithm)
+    if _is_stale(path, os.path.getmtime(source)):
+        compile_digest_index(source, algorithm, path, index_path)
+    return DigestIndex(path)
+
+
+# --- Scanning ---
+
+def _unhex(line):
+    try:
+        return binascii.unhexlify(line)
+    except ValueError:
+        return b""
+
+
+def scan_lines(lines, index, field=None):
+    """Check lines of hex digests; returns ([(line number from 0, digest hex, position)], invalid count)."""
+    if field is not None:
+        lines = [parts[field] if field < len(parts) else b"" for parts in (line.split(b":") for line in lines)]
+    lines = list(map(bytes.strip, lines))
+    width = index.width
+    packed = None
+    if list(map(len, lines)).count(width * 2) == len(lines):
+        # The usual case, every line a digest: decode them all in one call
+        try:
+            packed = binascii.unhexlify(b"".join(lines))
+        except ValueError:
+            pass
+    rejected = set()
+    if packed is None:
+        digests = list(map(_unhex, lines))
+        rejected = {i for i, digest in enumerate(digests) if len(digest) != width}
+        filler = bytes(width)  # keeps the packed digests aligned with the lines; its hits are dropped
+        packed = b"".join(filler if i in rejected else digest for i, digest in enumerate(digests))
+    matches = [(i, lines[i].decode("ascii").lower(), position)
+               for i, position in index.find_packed(packed) if i not in rejected]
+    return matches, len(rejected) - lines.count(b"")
+
+
+def split_ranges(size, workers):
+    """Byte ranges covering a file of size bytes, a few per worker and none over SEGMENT_BYTES."""
+    count = max(workers * 4, -(-size // SEGMENT_BYTES), 1)
+    step = -(-size // count) or 1
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def read_range(path, start, end):
+    """The lines whose first byte lies in [start, end) of path."""
+    with open(path, "rb") as file:
+        if start:
+            file.seek(start - 1)
+            file.readline()  # the rest of the line before start belongs to the previous range
+        position = file.tell()
+        if position >= end:
+            return []
+        data = file.read(end - position)
+        if not data.endswith(b"\n"):
+            data += file.readline()
+    lines = data.split(b"\n")
+    if lines[-1] == b"":
+        lines.pop()
+    return lines
+
+
+_index = None
+_field = None
+
+def init_worker(path, field):
+    global _index, _field
+    # Each worker maps the same index file, so the pages are shared.
+    _index = DigestIndex(path)
+    _field = field
+
+def scan_range(task):
+    """Scan one (path, start, end) range; returns (lines, invalid lines, matches numbered within the range)."""
+    lines = read_range(*task)
+    matches, invalid = scan_lines(lines, _index, _field)
+    return len(lines), invalid, matches
+
+
+# --- Driver ---
+
+def hash_audit(input_path, out, algorithm="sha1", fmt="jsonl", workers=None, field=None,
+               source=engine.PROHIBITED_FILE, digest_path=None):
+    """Check every hash in input_path (or - for stdin), write the matches to out and return a summary."""
+    workers = workers or os.cpu_count() or 1
+    start = time.perf_counter()
+    digest_path = digest_path or digest_path_for(source, algorithm)
+    open_digest_index(source, algorithm, digest_path).close()  # build it once, before the workers map it
+    index_path = index_path_for(source)
+    if _is_stale(index_path, os.path.getmtime(source)):
+        compile_blocklist(source, index_path)
+
+    write = make_writer(out, fmt)
+    count = invalid = found = 0
+    with BlocklistIndex(index_path) as passwords:
+        def emit(first_line, matches):
+            nonlocal found
+            for number, digest, position in matches:
+                found += 1
+                write([first_line + number + 1, digest, passwords.entry(position)])
+
+        if input_path == "-" or workers == 1:
+            init_worker(digest_path, field)
+            stream = sys.stdin.buffer if input_path == "-" else open(input_path, "rb")
+            try:
+                lines = []
+                for line in stream:
+                    lines.append(line)
+                    if len(lines) >= 100000:
+                        matches, bad = scan_lines(lines, _index, field)
+                        emit(count, matches)
+                        count, invalid = count + len(lines), invalid + bad
+                        lines = []
+                matches, bad = scan_lines(lines, _index, field)
+                emit(count, matches)
+                count, invalid = count + len(lines), invalid + bad
+            finally:
+                if stream is not sys.stdin.buffer:
+                    stream.close()
+        else:
+            ranges = [(input_path, start_byte, end_byte)
+                      for start_byte, end_byte in split_ranges(os.path.getsize(input_path), workers)]
+            with multiprocessing.Pool(workers, init_worker, (digest_path, field)) as pool:
+                for lines, bad, matches in pool.imap(scan_range, ranges):  # in input order
+                    emit(count, matches)
+                    count, invalid = count + lines, invalid + bad
+
+    elapsed = time.perf_counter() - start
+    return {
+        "algorithm": algorithm,
+        "lines": count,
+        "matches": found,
+        "invalid": invalid,
+        "seconds": round(elapsed, 3),
+        "lines_per_second": round(count / elapsed) if elapsed else None,
+    }
+
+
+def make_writer(out, fmt):
+    if fmt == "csv":
+        writer = csv.writer(out)
+        writer.writerow(FIELDS)
+        return lambda row: writer.writerow(row)
+    return lambda row: out.write(json.dumps(dict(zip(FIELDS, row)), ensure_ascii=False) + "\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check password hashes against the prohibited-password list.")
+    parser.add_argument("input", nargs="?", help="file with one hex digest per line, or - for stdin")
+    parser.add_argument("--algorithm", choices=sorted(ALGORITHMS), default="sha1")
+    parser.add_argument("--field", type=int, metavar="N",
+                        help="take the digest from the Nth colon-separated field (from 0), e.g. 3 for pwdump")
+    parser.add_argument("-o", "--output", help="matches file (default: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], default="jsonl")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="worker processes (default: all cores)")
+    parser.add_argument("--blocklist", default=engine.PROHIBITED_FILE, help="prohibited-password list")
+    parser.add_argument("--build", action="store_true", help="only build the digest index")
+    parser.add_argument("--summary", help="write the summary JSON here instead of stderr")
+    args = parser.parse_args(argv)
+
+    if args.build:
+        start = time.perf_counter()
+        path = compile_digest_index(args.blocklist, args.algorithm)
+        with DigestIndex(path) as index:
+            print(f"Wrote {len(index)} {args.algorithm} digests ({os.path.getsize(path)} bytes) to {path} "
+                  f"in {time.perf_counter() - start:.2f}s")
+        return
+    if not args.input:
+        parser.error("an input file is required unless --build is given")
+
+    out = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+    try:
+        summary = hash_audit(args.input, out, args.algorithm, args.format, args.workers, args.field,
+                             args.blocklist)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    if args.summary:
+        with open(args.summary, "w", encoding="utf-8") as file:
+            json.dump(summary, file, indent=2)
+    else:
+        print(json.dumps(summary, indent=2), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
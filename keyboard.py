@@ -0,0 +1,190 @@
+"""Keyboard adjacency graphs and walk detection.
+
+Each layout is drawn below as it looks on the keyboard, one token per key
+(unshifted character, then shifted). build_graph() turns a drawing into a
+KeyboardGraph: for every character, the keys in each direction around it.
+On the slanted layouts every row sits half a key further right than the
+one above it, so a key has six neighbours. On the keypad and other aligned
+layouts it has eight. A key drawn twice is one wide key, like the keypad's
+"0" under both "1" and "2". The graphs are built once at import.
+
+A walk is a stretch of at least three characters where each one is on a key
+next to the one before it, such as "qwerty", "1qaz" or "zaq1". Walks may turn
+("qwsd") and mix shifted and unshifted characters ("1QAZ"), but a step
+straight back the way the last one came ends a walk, so "1212" and "2020"
+are not walks. Each graph finds them in one O(n) pass. The step directions
+are looked up in C through a dict, and only the walks that are found are
+examined further.
+"""
+import math
+import operator
+import re
+from collections import namedtuple
+from itertools import repeat
+
+QWERTY = r"""
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) -_ =+
+    qQ wW eE rR tT yY uU iI oO pP [{ ]} \|
+     aA sS dD fF gG hH jJ kK lL ;: '"
+      zZ xX cC vV bB nN mM ,< .> /?
+"""
+
+AZERTY = r"""
+   &1 é2 "3 '4 (5 -6 è7 _8 ç9 à0 )° =+
+    aA zZ eE rR tT yY uU iI oO pP ^¨ $£
+     qQ sS dD fF gG hH jJ kK lL mM ù% *µ
+   <> wW xX cC vV bB nN ,? ;. :/ !§
+"""
+
+DVORAK = r"""
+`~ 1! 2@ 3# 4$ 5% 6^ 7& 8* 9( 0) [{ ]}
+    '" ,< .> pP yY fF gG cC rR lL /? =+ \|
+     aA oO eE uU iI dD hH tT nN sS -_
+      ;: qQ jJ kK xX bB mM wW vV zZ
+"""
+
+KEYPAD = r"""
+  / * -
+7 8 9 +
+4 5 6
+1 2 3
+0 0 .
+"""
+
+# Neighbour offsets (dx, dy), in the order a key's neighbours are listed.
+_SLANTED = ((-1, 0), (0, -1), (1, -1), (1, 0), (0, 1), (-1, 1))
+_ALIGNED = ((-1, 0), (-1, -1), (0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1))
+
+MIN_WALK = 3
+
+# text[start:end] is the walk; turns counts direction changes, the first step
+# included (so a straight walk has one); shifted counts shifted characters.
+Walk = namedtuple("Walk", ["graph", "start", "end", "turns", "shifted"])
+
+
+def _direction(index):
+    return chr(ord("0") + index)
+
+
+class KeyboardGraph:
+    """Adjacency of one layout's keys, with what walk scoring needs precomputed."""
+
+    def __init__(self, name, keys, neighbours, offsets):
+        self.name = name
+        self.keys = keys              # key tokens, e.g. "qQ"
+        self.neighbours = neighbours  # key token -> tuple of neighbouring tokens per direction
+        self.shifted = {c for key in keys for c in key[1:]}
+        # Starting positions and average branching, as in zxcvbn's guess estimate
+        self.starting_positions = sum(len(key) for key in keys)
+        self.average_degree = sum(sum(map(len, neighbours[key])) for key in keys) / len(keys)
+        # "ab" -> direction character, for every pair of adjacent characters. A
+        # wide key can touch a neighbour in two directions; the straight one wins.
+        self.steps = {}
+        order = sorted(range(len(offsets)), key=lambda i: 0 in offsets[i], reverse=True)
+        for direction in order:
+            for key in keys:
+                for neighbour in neighbours[key][direction]:
+                    for a in key:
+                        for b in neighbour:
+                            self.steps.setdefault(a + b, _direction(direction))
+        # The direction of reading along a row, left to right ("qwe", "123")
+        self.forward = _direction(offsets.index((1, 0)))
+        # direction -> the opposite one; a step straight back the way the last one came ends a walk
+        self.opposites = {_direction(i): _direction(offsets.index((-dx, -dy))) for i, (dx, dy) in enumerate(offsets)}
+        self._back = re.compile("|".join(f"(?<={d}){back}" for d, back in self.opposites.items()))
+
+    def __repr__(self):
+        return f"<KeyboardGraph {self.name}: {len(self.keys)} keys>"
+
+    def walks(self, text, min_length=MIN_WALK, bigrams=None):
+        """The maximal walks in text that are at least min_length characters long.
+
+        bigrams (text's consecutive pairs) can be passed in when several graphs
+        scan the same text.
+        """
+        if bigrams is None:
+            bigrams = list(map(operator.add, text, text[1:]))
+        steps = self._back.sub(" ", "".join(map(self.steps.get, bigrams, repeat(" "))))
+        found = []
+        for run in re.finditer("[^ ]{%d,}" % (min_length - 1), steps):
+            directions = run.group()
+            turns = 1 + sum(map(operator.ne, directions, directions[1:]))
+            start, end = run.start(), run.end() + 1
+            shifted = sum(c in self.shifted for c in text[start:end])
+            found.append(Walk(self.name, start, end, turns, shifted))
+        return found
+
+    def straight_walks(self, length):
+        """Every walk of length unshifted keys in one direction, as text."""
+        found = set()
+        for key in self.keys:
+            for direction in range(len(self.neighbours[key])):
+                paths = [[key]]
+                for _ in range(length - 1):
+                    paths = [path + [n] for path in paths for n in self.neighbours[path[-1]][direction]
+                             if self.steps[path[-1][0] + n[0]] == _direction(direction)]
+                found.update("".join(key[0] for key in path) for path in paths)
+        return found
+
+    def guesses(self, walk):
+        """Guesses to find the walk: every start, length and turn pattern up to it, then shifting."""
+        length = walk.end - walk.start
+        s = self.starting_positions
+        d = self.average_degree
+        guesses = 0
+        for i in range(2, length + 1):
+            for j in range(1, min(walk.turns, i - 1) + 1):
+                guesses += math.comb(i - 1, j - 1) * s * d ** j
+        if walk.shifted:
+            unshifted = length - walk.shifted
+            if not unshifted:
+                guesses *= 2
+            else:
+                guesses *= sum(math.comb(length, i) for i in range(1, min(walk.shifted, unshifted) + 1))
+        return guesses
+
+
+def build_graph(name, layout, slanted=True):
+    """Build a KeyboardGraph from a layout drawing like QWERTY above."""
+    positions = {}
+    tokens = layout.split()
+    size = len(tokens[0])
+    if any(len(token) != size for token in tokens):
+        raise ValueError(f"every key in the {name} layout must have {size} characters")
+    for y, line in enumerate(layout.split("\n")):
+        slant = y - 1 if slanted else 0
+        for match in re.finditer(r"\S+", line):
+            x, remainder = divmod(match.start() - slant, size + 1)
+            if remainder:
+                raise ValueError(f"key {match.group()!r} of the {name} layout is out of line")
+            positions[(x, y)] = match.group()
+    offsets = _SLANTED if slanted else _ALIGNED
+    neighbours = {}
+    for (x, y), key in positions.items():
+        around = neighbours.setdefault(key, [() for _ in offsets])
+        for direction, (dx, dy) in enumerate(offsets):
+            neighbour = positions.get((x + dx, y + dy))
+            if neighbour not in (None, key, *around[direction]):
+                around[direction] += (neighbour,)
+    return KeyboardGraph(name, list(neighbours), neighbours, offsets)
+
+
+GRAPHS = {
+    "qwerty": build_graph("qwerty", QWERTY),
+    "azerty": build_graph("azerty", AZERTY),
+    "dvorak": build_graph("dvorak", DVORAK),
+    "keypad": build_graph("keypad", KEYPAD, slanted=False),
+}
+
+
+def find_walks(text, graphs=None, min_length=MIN_WALK):
+    """The walks in text on each graph (all of GRAPHS by default); walks on different graphs may overlap."""
+    if graphs is None:
+        graphs = GRAPHS.values()
+    if len(text) < min_length:
+        return []
+    bigrams = list(map(operator.add, text, text[1:]))
+    found = []
+    for graph in graphs:
+        found += graph.walks(text, min_length, bigrams)
+    return found
@@ -0,0 +1,102 @@
+"""Load test for service.py.
+
+Opens several keep-alive connections to a running scoring service, sends
+requests (optionally pipelined) and reports latency percentiles and
+throughput.
+
+    python service.py --port 8080 &
+    python load_test.py --port 8080 --connections 32 --requests 20000 --pipeline 4
+"""
+import argparse
+import asyncio
+import json
+import random
+import string
+import time
+
+
+def _request(path, payload):
+    body = json.dumps(payload).encode("utf-8")
+    return (f"POST {path} HTTP/1.1\r\nHost: localhost\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1") + body
+
+
+async def _read_response(reader):
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    await reader.readexactly(length)
+    return status
+
+
+async def _client(host, port, requests, pipeline, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for start in range(0, len(requests), pipeline):
+            window = requests[start:start + pipeline]
+            sent = time.perf_counter()
+            writer.write(b"".join(window))
+            await writer.drain()
+            for _ in window:
+                status = await _read_response(reader)
+                latencies.append(time.perf_counter() - sent)
+                statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+async def run(host, port, connections, total, pipeline, batch):
+    rng = random.Random(0)
+    charset = string.ascii_letters + string.digits + "!@#$%^&*"
+
+    def password():
+        return "".join(rng.choices(charset, k=rng.randint(6, 20)))
+
+    if batch:
+        requests = [_request("/score/batch", {"passwords": [password() for _ in range(batch)]}) for _ in range(total)]
+    else:
+        requests = [_request("/score", {"password": password()}) for _ in range(total)]
+
+    latencies = []
+    statuses = {}
+    per_connection = [requests[i::connections] for i in range(connections)]
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, reqs, pipeline, latencies, statuses) for reqs in per_connection))
+    elapsed = time.perf_counter() - start
+    return latencies, statuses, elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure latency and throughput of service.py.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=5000, help="total requests")
+    parser.add_argument("--pipeline", type=int, default=1, help="requests in flight per connection")
+    parser.add_argument("--batch", type=int, default=0, help="passwords per request (0: single endpoint)")
+    args = parser.parse_args(argv)
+
+    latencies, statuses, elapsed = asyncio.run(
+        run(args.host, args.port, args.connections, args.requests, args.pipeline, args.batch))
+    latencies.sort()
+    print(f"{len(latencies)} requests in {elapsed:.2f}s: {len(latencies) / elapsed:.0f} req/s"
+          + (f", {len(latencies) * args.batch / elapsed:.0f} passwords/s" if args.batch else ""))
+    print(f"latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms, "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms, max {latencies[-1] * 1000:.2f} ms")
+    print("status codes:", statuses)
+
+
+if __name__ == "__main__":
+    main()
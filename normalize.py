@@ -0,0 +1,68 @@
+"""Canonical forms for fuzzy blocklist matching.
+
+Variants such as "P@ssw0rd", "Qwerty123!" and "DRAGON" are reduced to the
+form of the list entry they come from, so a blocklist of canonical forms
+catches them with a few lookups instead of enumerating variants:
+
+* case is folded;
+* leet substitutions are undone ("@" and "4" -> "a", "0" -> "o", ...).
+  "1", "!" and "|" become "i"; letters are never folded, so "l" stays "l";
+* digit and symbol affixes are stripped ("dragon2024!" -> "dragon").
+
+Entries are indexed under their folded form, unstripped. A password is
+looked up both whole and with its affixes stripped, so a stripped core
+only matches when it is itself a list entry, a word rather than the tail
+of a random string, and only when it keeps MIN_CORE characters.
+
+Affixes are stripped before leet folding, since a trailing "1" is usually
+a suffix rather than an "i". Leading leet characters ("4dmin") can only be
+recognised without stripping, so a password gives several candidate forms.
+"""
+import re
+
+MIN_CORE = 6  # shorter cores are not stripped down to: random passwords end in short words too often
+
+_LEET = str.maketrans({
+    "@": "a", "4": "a",
+    "8": "b",
+    "3": "e",
+    "9": "g",
+    "1": "i", "!": "i", "|": "i",
+    "0": "o",
+    "$": "s", "5": "s",
+    "7": "t", "+": "t",
+})
+_TRAILING_SYMBOLS = re.compile(r"[^\w\s]+$")
+_TRAILING_AFFIX = re.compile(r"[\W\d_]+$")
+_LEADING_AFFIX = re.compile(r"^[\W\d_]+")
+
+
+def fold(text):
+    """Lowercase text and undo leet substitutions."""
+    return text.lower().translate(_LEET)
+
+
+def _cuts(password):
+    """The password with successively more affix stripped, least stripped first."""
+    lowered = password.lower()
+    without_symbols = _TRAILING_SYMBOLS.sub("", lowered)
+    without_suffix = _TRAILING_AFFIX.sub("", lowered)
+    core = _LEADING_AFFIX.sub("", without_suffix)
+    return lowered, without_symbols, without_suffix, core
+
+
+def candidate_forms(password):
+    """Canonical forms to look up for password: at most four, all distinct."""
+    lowered, *stripped = _cuts(password)
+    forms = [fold(lowered)]
+    for cut in stripped:
+        if len(cut) >= MIN_CORE:
+            form = fold(cut)
+            if form not in forms:
+                forms.append(form)
+    return forms
+
+
+def canonical_form(entry):
+    """The form an entry is indexed under: the first of its candidates, so it matches itself."""
+    return fold(entry)
@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
-import math
+
+from engine import estimate_guesses, profile
 
 style = ttk.Style()
 
@@ -12,7 +13,7 @@ root.maxsize(1000, 1000)
 root.geometry("600x600+100+100")
 
 def length_score(password):
-    length = len(password)
+    length = profile(password).length
     if length == 0:
         print("Password is empty")
         return 0
@@ -28,12 +29,7 @@ def length_score(password):
         return 10
 
 def variety_score(password):
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_symbol = any(not c.isalnum() for c in password)
-
-    types_used = sum([has_lower, has_upper, has_digit, has_symbol])
+    types_used = profile(password).types_used
 
     if types_used == 1:
         return 2
@@ -47,28 +43,11 @@ def variety_score(password):
         return 0
     
 def calculate_entropy(password):
-    lowercase = any(c.islower() for c in password)
-    uppercase = any(c.isupper() for c in password)
-    digits = any(c.isdigit() for c in password)
-    symbols = any(not c.isalnum() for c in password)
-
-    escore = 0
-    if lowercase:
-        escore += 26
-    if uppercase:
-        escore += 26
-    if digits:
-        escore += 10
-    if symbols:
-        escore += 33
-
-    if escore == 0 or len(password) == 0:   
-        return 0
-   
-    entropy = len(password) * math.log2(escore)
-    return entropy
+    # Bits of guessing work, so "Password1!" rates as the weak password it is
+    return estimate_guesses(password).bits
 
 def calculate_strength(password):
+    password = profile(password)
     length = length_score(password)
     variety = variety_score(password)
     total_strength = length + variety
@@ -0,0 +1,166 @@
+"""Per-stage timing hooks with HDR-style latency histograms.
+
+Wrap a stage in ``with profiler.stage("score"):`` to record how long it
+takes. While the profiler is disabled, stage() returns a shared no-op
+context manager and nothing is timed or stored, so the hooks can stay in
+hot paths. Enable it with profiler.enabled = True or, for the module-wide
+PROFILER, by setting PWCHECK_PROFILE=1 in the environment.
+
+Timings go into log-linear histograms in the style of HdrHistogram. Every
+power-of-two range is split into 2**SUB_BUCKET_BITS equal buckets, so a
+recorded value is off by at most 1/32 (about 3%). The histogram is a flat
+list of counts that recording only ever increments, and there is no
+allocation per sample.
+
+Results are available as a dict (snapshot), as JSON (dump_json), or as
+Prometheus text (prometheus_text).
+"""
+import contextlib
+import json
+import os
+import threading
+import time
+
+SUB_BUCKET_BITS = 5
+_SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+_OFF = contextlib.nullcontext()
+
+
+def bucket_index(value):
+    """Bucket of a non-negative integer; values below 2 * _SUB_BUCKETS get a bucket each."""
+    shift = max(0, value.bit_length() - SUB_BUCKET_BITS - 1)
+    return (shift << SUB_BUCKET_BITS) + (value >> shift)
+
+
+def bucket_bounds(index):
+    """(lowest, highest) value that falls in bucket index."""
+    shift = max(0, (index >> SUB_BUCKET_BITS) - 1)
+    low = (index - (shift << SUB_BUCKET_BITS)) << shift
+    return low, low + (1 << shift) - 1
+
+
+class Histogram:
+    """Log-linear histogram of non-negative integers (nanoseconds, here)."""
+
+    def __init__(self):
+        self.counts = []
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+
+    def record(self, value):
+        value = max(0, int(value))
+        index = bucket_index(value)
+        if index >= len(self.counts):
+            self.counts.extend([0] * (index + 1 - len(self.counts)))
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other):
+        if len(other.counts) > len(self.counts):
+            self.counts.extend([0] * (len(other.counts) - len(self.counts)))
+        for index, n in enumerate(other.counts):
+            self.counts[index] += n
+        self.count += other.count
+        self.total += other.total
+        if other.count:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+    def percentile(self, q):
+        """Highest value in the bucket holding the q-th quantile (0 <= q <= 1), capped at max."""
+        if not self.count:
+            return 0
+        rank = max(1, round(q * self.count))
+        seen = 0
+        for index, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(bucket_bounds(index)[1], self.max)
+        return self.max
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min or 0,
+            "max": self.max or 0,
+            "mean": self.total / self.count if self.count else 0.0,
+            "percentiles": {str(q): self.percentile(q) for q in QUANTILES},
+            "buckets": {bucket_bounds(index)[0]: n for index, n in enumerate(self.counts) if n},
+        }
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start")
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, time.perf_counter_ns() - self.start)
+
+
+class Profiler:
+    """Named stage histograms, safe to record into from several threads."""
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def stage(self, name):
+        """Context manager that records the time spent in its block under name."""
+        if not self.enabled:
+            return _OFF
+        return _Stage(self, name)
+
+    def record(self, name, nanoseconds):
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = Histogram()
+            histogram.record(nanoseconds)
+
+    def reset(self):
+        with self._lock:
+            self.histograms.clear()
+
+    def snapshot(self):
+        """{stage: Histogram.to_dict()}, all values in nanoseconds."""
+        with self._lock:
+            return {name: histogram.to_dict() for name, histogram in sorted(self.histograms.items())}
+
+    def dump_json(self, path=None):
+        """Return the snapshot as JSON text, also writing it to path if given."""
+        text = json.dumps({"unit": "ns", "stages": self.snapshot()}, indent=2)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return text
+
+    def prometheus_text(self, name="pwcheck_stage_seconds"):
+        """The histograms as a Prometheus summary, one series per stage."""
+        lines = [f"# HELP {name} Time spent in each stage.", f"# TYPE {name} summary"]
+        for stage, data in self.snapshot().items():
+            for q, value in data["percentiles"].items():
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {value / 1e9:.9f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {data["sum"] / 1e9:.9f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {data["count"]}')
+        return "\n".join(lines) + "\n"
+
+
+PROFILER = Profiler(enabled=bool(os.environ.get("PWCHECK_PROFILE")))
@@ -0,0 +1,184 @@
+"""Bulk password provisioning.
+
+Generates large numbers of Easy/Medium/Hard passwords without a GUI. Random
+bytes are drawn from the OS CSPRNG in large blocks and mapped onto the
+mode's character classes with NumPy, a whole block at a time:
+
+* each row gets the same class layout as generator.plan() (required classes
+  plus free positions), shuffled per row by sorting random keys;
+* bytes are mapped to characters without modulo bias: bytes at or above the
+  largest multiple of the pool size are discarded before taking the
+  remainder, so every character of a pool is equally likely;
+* rows with a sequence penalty (a keyboard walk, alphabet run or common
+  word) or on the prohibited list are drawn again as a smaller block, and
+  the last few are replaced with generator.generate_password(), so every
+  password written meets the same rules as the interactive generator.
+
+Output is streamed to a file, one password per line; --workers shards the
+work across processes.
+
+    python provision.py --mode Hard --length 16 --count 1000000 -o passwords.txt --workers 4
+
+NumPy is optional; without it every password comes from the scalar generator.
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+
+import batch
+import engine
+import generator
+from blocklist import BlocklistIndex, FilteredBlocklist, open_blocklist
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+_blocklist = None
+
+
+def _init_worker(blocklist_path):
+    global _blocklist
+    _blocklist = open_blocklist(blocklist_path) if blocklist_path else ()
+
+
+def _uniform_indices(count, size):
+    """count unbiased random integers in [0, size), from os.urandom."""
+    limit = 256 - 256 % size
+    out = np.empty(0, dtype=np.uint8)
+    while len(out) < count:
+        need = count - len(out)
+        raw = np.frombuffer(os.urandom(need + need // 4 + 16), dtype=np.uint8)
+        out = np.concatenate([out, raw[raw < limit][:need]])
+    return out % size
+
+
+def _layout_rows(mode, length, count):
+    """Class bit for every cell of a count x length block, shuffled per row."""
+    generator.plan(mode, length)  # raises ValueError for impossible mode/length pairs
+    required = generator.required_classes(mode, length)
+    row = [bit for bit, n in required.items() for _ in range(n)] + [0] * (length - sum(required.values()))
+    keys = np.frombuffer(os.urandom(count * length * 4), dtype=np.uint32).reshape(count, length)
+    return np.array(row, dtype=np.uint8)[np.argsort(keys, axis=1)]
+
+
+def generate_block(mode, length, count, prohibited_passwords=()):
+    """Return a list of count passwords for mode and length."""
+    if np is None:
+        return [generator.generate_password(mode, length, prohibited_passwords) for _ in range(count)]
+
+    settings = generator.MODES[mode]
+    layout = _layout_rows(mode, length, count)
+    chars = np.empty(layout.shape, dtype=np.uint8)
+    any_chars = "".join(generator.CLASS_CHARS[bit] for bit in settings.charset_classes)
+    for bit, pool in [(0, any_chars)] + [(bit, generator.CLASS_CHARS[bit]) for bit in settings.charset_classes]:
+        cells = layout == bit
+        n = int(cells.sum())
+        if n:
+            table = np.frombuffer(pool.encode("ascii"), dtype=np.uint8)
+            chars[cells] = table[_uniform_indices(n, len(table))]
+
+    text = chars.tobytes().decode("ascii")
+    passwords = [text[i:i + length] for i in range(0, len(text), length)]
+
+    rejected = np.asarray(batch.sequence_hits(passwords)) > 0
+    if prohibited_passwords:
+        entries = _entries_of_length(prohibited_passwords, length)
+        if entries is not None:
+            rejected |= np.isin(np.frombuffer(text.encode("ascii"), dtype=f"S{length}"), entries)
+        else:
+            rejected |= np.fromiter((p in prohibited_passwords for p in passwords), dtype=bool, count=count)
+    rejected = np.flatnonzero(rejected).tolist()
+    if _SCALAR_REPLACEMENTS < len(rejected) <= count // 2:
+        replacements = generate_block(mode, length, len(rejected), prohibited_passwords)
+    else:  # checked against both as they are drawn
+        replacements = [generator.generate_password(mode, length, prohibited_passwords) for _ in rejected]
+    for i, password in zip(rejected, replacements):
+        passwords[i] = password
+    return passwords
+
+
+_SCALAR_REPLACEMENTS = 64  # fewer rejected rows than this come straight from the generator
+
+
+_entries_cache = {}  # (id(blocklist), length) -> (blocklist, entries)
+
+
+def _entries_of_length(prohibited_passwords, length):
+    """The blocklist's ASCII entries of exactly length characters as a NumPy bytes array.
+
+    Generated passwords are fixed-length ASCII, so a whole block is checked
+    against these with one np.isin. Returns None for containers whose
+    membership is more than their entries (a NormalizedBlocklist), which
+    are then asked one password at a time.
+    """
+    key = (id(prohibited_passwords), length)
+    cached = _entries_cache.get(key)
+    if cached is not None and cached[0] is prohibited_passwords:
+        return cached[1]
+    if isinstance(prohibited_passwords, FilteredBlocklist):
+        raw = prohibited_passwords.index.iter_bytes()
+    elif isinstance(prohibited_passwords, BlocklistIndex):
+        raw = prohibited_passwords.iter_bytes()
+    elif isinstance(prohibited_passwords, (set, frozenset)):
+        raw = (p.encode("utf-8", "surrogatepass") for p in prohibited_passwords if isinstance(p, str))
+    else:
+        return None
+    entries = np.array([e for e in raw if len(e) == length and e.isascii() and b"\0" not in e],
+                       dtype=f"S{length}")
+    _entries_cache[key] = (prohibited_passwords, entries)
+    return entries
+
+
+def _generate_shard(task):
+    mode, length, count = task
+    blocklist = _blocklist if _blocklist is not None else engine.default_prohibited_passwords()
+    return "\n".join(generate_block(mode, length, count, blocklist)) + "\n"
+
+
+def provision(out, mode, length, count, block_size=50_000, workers=1,
+              blocklist_path=engine.PROHIBITED_FILE):
+    """Write count passwords to out; returns the number of seconds taken."""
+    generator.plan(mode, length)
+    tasks = [(mode, length, min(block_size, count - start)) for start in range(0, count, block_size)]
+    start = time.perf_counter()
+    if workers <= 1:
+        _init_worker(blocklist_path)
+        for task in tasks:
+            out.write(_generate_shard(task))
+    else:
+        with multiprocessing.Pool(workers, _init_worker, (blocklist_path,)) as pool:
+            for text in pool.imap_unordered(_generate_shard, tasks):
+                out.write(text)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate passwords in bulk.")
+    parser.add_argument("--mode", choices=sorted(generator.MODES), default="Hard")
+    parser.add_argument("--length", type=int, default=16)
+    parser.add_argument("--count", type=int, required=True)
+    parser.add_argument("-o", "--output", help="output file (default: stdout)")
+    parser.add_argument("--workers", type=int, default=1, help="processes to shard the work over")
+    parser.add_argument("--block-size", type=int, default=50_000, help="passwords generated per block")
+    parser.add_argument("--blocklist", default=engine.PROHIBITED_FILE, help="prohibited-password list")
+    args = parser.parse_args(argv)
+
+    out = open(args.output, "w", encoding="ascii") if args.output else sys.stdout
+    try:
+        elapsed = provision(out, args.mode, args.length, args.count, args.block_size,
+                            args.workers, args.blocklist)
+    except ValueError as exc:
+        parser.error(str(exc))
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{args.count:,} passwords in {elapsed:.2f}s ({args.count / elapsed * 60:,.0f} per minute)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""Linear-time repetition and periodicity detection.
+
+Finds three kinds of predictable stretches in a string:
+
+* arithmetic sequences of code points with a step of up to 2 ("abcd",
+  "9876", "2468"), from one scan for equal consecutive differences;
+* runs of one character ("aaa") and short blocks repeated anywhere
+  ("x1212y", "abcabc"), with a period of up to LOCAL_PERIOD, from one regex
+  whose backreference only ever spans LOCAL_PERIOD characters;
+* blocks of any length repeated at the start or end of the string
+  ("Summer2024Summer2024!", "!abcdabcd"), from the prefix function of the
+  string and of its reverse.
+
+Each step is O(n), and everything except the prefix function runs inside
+C-level str/regex operations. The repeated-block steps are skipped
+unless some bigram occurs twice, because no block can repeat without one.
+That check is a single set() call, so most random passwords only pay for
+the difference scan, and each prefix function only runs when the bigram it
+would start from occurs again far enough away.
+"""
+import operator
+import re
+from collections import namedtuple
+from itertools import repeat
+
+LOCAL_PERIOD = 4  # longest block repeated mid-string that is looked for
+MAX_STEP = 2      # largest code-point step treated as an arithmetic sequence
+
+# kind is "run", "sequence" or "repeat"; text[start + period:end] is predictable
+# from what comes before it (period is 1 for runs and sequences).
+Pattern = namedtuple("Pattern", ["kind", "start", "end", "period"])
+
+# Consecutive differences are encoded as one character each; steps outside
+# +-MAX_STEP all map to "\0", which _STEP_RUN never matches, and neither
+# does it match the zero step (runs are left to _LOCAL_REPEAT).
+_STEP_CHARS = {step: chr(step + MAX_STEP + 1) for step in range(-MAX_STEP, MAX_STEP + 1)}
+# The same encoding looked up by bigram, for ASCII text.
+_ASCII_STEPS = {chr(a) + chr(a + step): c for step, c in _STEP_CHARS.items()
+                for a in range(128) if 0 <= a + step < 128}
+_STEP_RUN = re.compile("([%s])\\1+" % "".join(c for step, c in _STEP_CHARS.items() if step))
+# Three or more of one character, or two or more copies of a 2..LOCAL_PERIOD block.
+_LOCAL_REPEAT = re.compile(r"(.)\1\1+|(.{2,%d}?)\2+" % LOCAL_PERIOD, re.DOTALL)
+
+
+def prefix_function(text):
+    """pi[i] = length of the longest proper border of text[:i + 1] (Knuth-Morris-Pratt)."""
+    pi = [0] * len(text)
+    k = 0
+    for i in range(1, len(text)):
+        c = text[i]
+        while k and text[k] != c:
+            k = pi[k - 1]
+        if text[k] == c:
+            k += 1
+        pi[i] = k
+    return pi
+
+
+def _periodic_prefix(text):
+    """(length, period) of the longest prefix made of at least two copies of a block, or None."""
+    best = None
+    for i, border in enumerate(prefix_function(text)):
+        length = i + 1
+        period = length - border
+        if border and length >= 2 * period:
+            best = (length, period)
+    return best
+
+
+def find_patterns(text):
+    """Return the Patterns in text (compare case-insensitively by passing text.lower())."""
+    n = len(text)
+    patterns = []
+    if n < 3:
+        return patterns
+
+    bigrams = list(map(operator.add, text, text[1:]))
+    if text.isascii():
+        steps = "".join(map(_ASCII_STEPS.get, bigrams, repeat("\0")))
+    else:
+        codes = list(map(ord, text))
+        steps = "".join(map(_STEP_CHARS.get, map(operator.sub, codes[1:], codes), repeat("\0")))
+    for match in _STEP_RUN.finditer(steps):
+        patterns.append(Pattern("sequence", match.start(), match.end() + 1, 1))
+
+    if len(set(bigrams)) == n - 1:  # no bigram repeats, so no block does
+        return patterns
+
+    for match in _LOCAL_REPEAT.finditer(text):
+        if match.group(1):
+            patterns.append(Pattern("run", match.start(), match.end(), 1))
+        else:
+            patterns.append(Pattern("repeat", match.start(), match.end(), len(match.group(2))))
+
+    # Periods up to LOCAL_PERIOD were found above. A longer block repeated
+    # from the start means the first bigram occurs again past LOCAL_PERIOD
+    # (and likewise at the end), so most strings skip the prefix functions.
+    prefix = text.find(text[:2], LOCAL_PERIOD + 1) != -1 and _periodic_prefix(text)
+    if prefix:
+        length, period = prefix
+        patterns.append(Pattern("repeat", 0, length, period))
+        if length == n:
+            return patterns
+    suffix = text.find(text[-2:], 0, n - LOCAL_PERIOD - 1) != -1 and _periodic_prefix(text[::-1])
+    if suffix:
+        length, period = suffix
+        patterns.append(Pattern("repeat", n - length, n, period))
+    return patterns
+
+
+def predictable_characters(text):
+    """Number of characters in text that a pattern found by find_patterns() predicts."""
+    patterns = find_patterns(text)
+    if not patterns:
+        return 0
+    marked = bytearray(len(text))
+    for pattern in patterns:
+        first = pattern.start + pattern.period
+        marked[first:pattern.end] = b"\x01" * (pattern.end - first)
+    return marked.count(1)
@@ -0,0 +1,72 @@
+"""Run scoring off the UI thread and keep only the newest result.
+
+Every submit() bumps a generation counter. Work that has been superseded by
+the time it starts is skipped, results that are superseded by the time they
+finish are dropped, and the UI thread collects whatever is left with
+take_latest() from its own event loop, so it never waits on the engine.
+"""
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+class LatestOnlyExecutor:
+    """Worker pool that delivers results for the most recent submission only."""
+
+    def __init__(self, max_workers=1):
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="scorer")
+        self._results = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self.dropped = 0
+
+    def submit(self, fn, *args):
+        """Queue fn(*args), superseding everything submitted before; return its generation."""
+        with self._lock:
+            self._generation += 1
+            generation = self._generation
+        self._executor.submit(self._run, generation, fn, args)
+        return generation
+
+    def cancel(self):
+        """Mark everything submitted so far as stale."""
+        with self._lock:
+            self._generation += 1
+
+    def is_current(self, generation):
+        return generation == self._generation
+
+    def _run(self, generation, fn, args):
+        if not self.is_current(generation):
+            self.dropped += 1
+            return
+        try:
+            result = fn(*args)
+        except Exception as exc:  # handed to the UI thread rather than lost in the pool
+            result = exc
+        if self.is_current(generation):
+            self._results.put((generation, args, result))
+        else:
+            self.dropped += 1
+
+    def take_latest(self):
+        """Return (args, result) for the newest finished submission, or None.
+
+        Call from the UI thread; never blocks. Results that became stale
+        while waiting in the queue are discarded.
+        """
+        latest = None
+        while True:
+            try:
+                generation, args, result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if self.is_current(generation):
+                latest = (args, result)
+            else:
+                self.dropped += 1
+        return latest
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
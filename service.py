@@ -0,0 +1,226 @@
+"""Local HTTP scoring service.
+
+A small asyncio HTTP/1.1 server around the scoring engine and the compiled
+prohibited-password index, for other services that cannot import the Tk app.
+
+    POST /score        {"password": "..."}          -> one evaluation
+    POST /score/batch  {"passwords": ["...", ...]}  -> {"results": [...]}
+    GET  /health                                    -> {"status": "ok", ...}
+    GET  /metrics                                   -> Prometheus text format
+
+Connections are kept alive and pipelined requests are answered in order.
+Scoring runs in a process pool (--workers, 0 to score on the event loop).
+At most --max-pending requests are waiting for the pool at any time; beyond
+that the server answers 503 instead of queueing without bound. Repeat
+submissions are answered from an HMAC-keyed LRU cache (--cache-size 0 to
+turn it off) without going to the pool. With --profile, /metrics also
+reports per-stage latency percentiles (cache lookup, scoring, whole request).
+
+    python service.py --port 8080 --workers 4
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import engine
+from audit import init_worker, score_chunk
+from cache import EvaluationCache
+from profiling import Profiler
+
+
+def _evaluation_dict(evaluation):
+    return dict(zip(engine.Evaluation._fields, evaluation))
+
+
+class ScoringService:
+    """Request handling for the HTTP server; one instance per process."""
+
+    def __init__(self, workers=None, max_pending=256, max_batch=1000, max_body=1 << 20,
+                 blocklist_path=engine.PROHIBITED_FILE, cache_size=4096, cache_ttl=300.0, profile=False):
+        self.cache = EvaluationCache(cache_size, cache_ttl)
+        self.profiler = Profiler(enabled=profile)
+        self.max_pending = max_pending
+        self.max_batch = max_batch
+        self.max_body = max_body
+        self.pending = 0
+        self.rejected = 0
+        self.served = 0
+        if workers == 0:
+            init_worker(blocklist_path)
+            self._pool = None
+        else:
+            self._pool = ProcessPoolExecutor(workers or os.cpu_count(), initializer=init_worker,
+                                             initargs=(blocklist_path,))
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(cancel_futures=True)
+
+    async def score(self, passwords):
+        """Score passwords, using the cache first; None if the server is at max_pending."""
+        with self.profiler.stage("cache"):
+            results = [self.cache.get(password) for password in passwords]
+        missing = [i for i, result in enumerate(results) if result is None]
+        if not missing:
+            return results
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            return None
+
+        to_score = [passwords[i] for i in missing]
+        self.pending += 1
+        try:
+            with self.profiler.stage("score"):
+                if self._pool is None:
+                    scored = score_chunk(to_score)
+                else:
+                    scored = await asyncio.get_running_loop().run_in_executor(self._pool, score_chunk, to_score)
+        finally:
+            self.pending -= 1
+        for i, password, result in zip(missing, to_score, scored):
+            results[i] = result
+            self.cache.put(password, result)
+        return results
+
+    async def dispatch(self, method, path, body):
+        """Return (status, payload) for one request."""
+        if path == "/health" and method == "GET":
+            return HTTPStatus.OK, {"status": "ok", "pending": self.pending,
+                                   "served": self.served, "rejected": self.rejected,
+                                   "cache": self.cache.stats()}
+        if path == "/metrics" and method == "GET":
+            return HTTPStatus.OK, self.metrics()
+        if path not in ("/score", "/score/batch"):
+            return HTTPStatus.NOT_FOUND, {"error": "not found"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "use POST"}
+
+        try:
+            request = json.loads(body)
+            if path == "/score":
+                passwords = [request["password"]]
+            else:
+                passwords = request["passwords"]
+            if not isinstance(passwords, list) or not all(isinstance(p, str) for p in passwords):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            return HTTPStatus.BAD_REQUEST, {"error": "expected JSON with 'password' or 'passwords'"}
+        if len(passwords) > self.max_batch:
+            return HTTPStatus.REQUEST_ENTITY_TOO_LARGE, {"error": f"at most {self.max_batch} passwords per batch"}
+
+        results = await self.score(passwords)
+        if results is None:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": "server busy, retry later"}
+        self.served += len(passwords)
+        if path == "/score":
+            return HTTPStatus.OK, _evaluation_dict(results[0])
+        return HTTPStatus.OK, {"results": [_evaluation_dict(r) for r in results]}
+
+    def metrics(self):
+        """Counters, cache statistics and stage histograms in Prometheus text format."""
+        cache = self.cache.stats()
+        lines = []
+        for name, kind, value, help_text in [
+            ("pwcheck_requests_pending", "gauge", self.pending, "Requests waiting for a worker."),
+            ("pwcheck_passwords_served_total", "counter", self.served, "Passwords scored and returned."),
+            ("pwcheck_requests_rejected_total", "counter", self.rejected, "Requests answered 503."),
+            ("pwcheck_cache_hits_total", "counter", cache["hits"], "Cache hits."),
+            ("pwcheck_cache_misses_total", "counter", cache["misses"], "Cache misses."),
+            ("pwcheck_cache_entries", "gauge", cache["size"], "Entries in the cache."),
+        ]:
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}", f"{name} {value}"]
+        return "\n".join(lines) + "\n" + self.profiler.prometheus_text()
+
+    async def handle_connection(self, reader, writer):
+        """Serve requests on one connection until the client closes it."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "bad request line"}, False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                connection = headers.get("connection", "").lower()
+                keep_alive = connection == "keep-alive" or (version == "HTTP/1.1" and connection != "close")
+                length = headers.get("content-length", "0")
+                if not (length.isascii() and length.isdigit()):
+                    await self._respond(writer, HTTPStatus.BAD_REQUEST, {"error": "bad Content-Length"}, False)
+                    break
+                length = int(length)
+                if length > self.max_body:
+                    await self._respond(writer, HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                                        {"error": f"body must be at most {self.max_body} bytes"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+
+                with self.profiler.stage("request"):
+                    status, payload = await self.dispatch(method, target.split("?", 1)[0], body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        if isinstance(payload, str):  # /metrics
+            body, content_type = payload.encode("utf-8"), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode("utf-8"), "application/json"
+        writer.write(
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body)
+        await writer.drain()  # stop reading from clients that do not read their responses
+
+
+async def serve(host, port, service):
+    server = await asyncio.start_server(service.handle_connection, host, port)
+    print(f"Scoring service listening on http://{host}:{port}")
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve password scoring over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, default=None,
+                        help="scoring processes (default: all cores, 0: score on the event loop)")
+    parser.add_argument("--max-pending", type=int, default=256, help="requests allowed to wait for a worker")
+    parser.add_argument("--max-batch", type=int, default=1000, help="passwords allowed per batch request")
+    parser.add_argument("--blocklist", default=engine.PROHIBITED_FILE, help="prohibited-password list")
+    parser.add_argument("--cache-size", type=int, default=4096, help="cached results (0 turns the cache off)")
+    parser.add_argument("--cache-ttl", type=float, default=300.0, help="seconds a cached result stays valid")
+    parser.add_argument("--profile", action="store_true", help="record per-stage latency for /metrics")
+    args = parser.parse_args(argv)
+
+    service = ScoringService(args.workers, args.max_pending, args.max_batch, blocklist_path=args.blocklist,
+                             cache_size=args.cache_size, cache_ttl=args.cache_ttl, profile=args.profile)
+    try:
+        asyncio.run(serve(args.host, args.port, service))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Search-based password strengthener.
+
+Finds the smallest edits to a password that bring its total_score() into a
+target range. The search is a beam search over single-character edits
+(insert, substitute and, for targets below the current score, delete):
+every level applies one more edit, the best beam_width candidates by
+distance to the range are kept, and the first level that produces in-range
+passwords gives the answers. It stops at a fixed time budget and reports
+whether the range could not be reached or the search ran out of time.
+"""
+import secrets
+import string
+import time
+from collections import namedtuple
+
+import engine
+from generator import SYMBOLS
+
+THRESHOLDS = {
+    "Moderate": (60, 75),      # 60-75% strength
+    "Strong": (75, 90),        # 75-90% strength
+    "Very Strong": (90, 100),  # 90-100% strength
+}
+
+# status is one of the constants below; edits is how many edits the options needed.
+StrengthenResult = namedtuple("StrengthenResult", ["options", "edits", "status"])
+FOUND = "found"                # count options were found
+PARTIAL = "partial"            # some, but fewer than count, were found in time
+ALREADY_IN_RANGE = "already"   # the password is already in the target range
+UNREACHABLE = "unreachable"    # the search ran out of candidates or edits without a match
+TIMEOUT = "timeout"            # nothing was found before the time budget ran out
+
+_rng = secrets.SystemRandom()
+_CLASS_POOLS = (string.ascii_lowercase, string.ascii_uppercase, string.digits, SYMBOLS)
+_ALL_CHARS = "".join(_CLASS_POOLS)
+_MAX_POSITIONS = 6  # edit positions tried per candidate and level, so a level costs the same at any length
+
+
+def _alphabet(rng):
+    """A fresh random handful of characters, at least one from every class."""
+    return [rng.choice(pool) for pool in _CLASS_POOLS] + [rng.choice(_ALL_CHARS) for _ in range(4)]
+
+
+def _positions(n, rng):
+    """Up to _MAX_POSITIONS distinct random positions in range(n)."""
+    if n <= _MAX_POSITIONS:
+        return range(n)
+    return rng.sample(range(n), _MAX_POSITIONS)
+
+
+def _neighbours(password, alphabet, allow_delete, rng):
+    for i in _positions(len(password) + 1, rng):
+        for c in alphabet:
+            yield password[:i] + c + password[i:]
+    for i in _positions(len(password), rng):
+        for c in alphabet:
+            if c != password[i]:
+                yield password[:i] + c + password[i + 1:]
+    if allow_delete:
+        for i in range(len(password)):
+            yield password[:i] + password[i + 1:]
+
+
+def _distance(score, low, high):
+    if score < low:
+        return low - score
+    if score > high:
+        return score - high
+    return 0
+
+
+def strengthen(password, desired_strength, count=3, time_budget=0.25, beam_width=24,
+               max_edits=32, prohibited_passwords=(), rng=None):
+    """Return a StrengthenResult with up to count distinct passwords in the target range.
+
+    rng defaults to the system CSPRNG; pass a seeded random.Random (and a
+    generous time_budget) to make a search repeatable.
+    """
+    rng = rng or _rng
+    low, high = THRESHOLDS.get(desired_strength, THRESHOLDS["Very Strong"])
+    score, *_ = engine.total_score(password)
+    if low <= score <= high:
+        return StrengthenResult([], 0, ALREADY_IN_RANGE)
+
+    deadline = time.perf_counter() + time_budget
+    allow_delete = score > high
+    beam = [password]
+    seen = {password}
+    found = []
+    found_at = 0
+    timed_out = False
+    for edits in range(1, max_edits + 1):
+        alphabet = _alphabet(rng)
+        candidates = []
+        for base in beam:
+            for candidate in _neighbours(base, alphabet, allow_delete, rng):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                distance = _distance(engine.total_score(candidate)[0], low, high)
+                if distance == 0:
+                    if candidate not in prohibited_passwords:
+                        found.append(candidate)
+                        found_at = found_at or edits
+                else:
+                    candidates.append((distance, rng.random(), candidate))
+            if time.perf_counter() > deadline:
+                timed_out = True
+                break
+        if len(found) >= count:
+            return StrengthenResult(rng.sample(found, count), found_at, FOUND)
+        if timed_out or not candidates:
+            break
+        candidates.sort()
+        beam = [candidate for _, _, candidate in candidates[:beam_width]]
+
+    if found:
+        return StrengthenResult(found, found_at, PARTIAL)
+    return StrengthenResult([], 0, TIMEOUT if timed_out else UNREACHABLE)
@@ -1,9 +1,39 @@
+import time
+_app_start = time.perf_counter()
+
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
 import math
+import os
 import random
 import string
-from tkinter import font
+import subprocess
+import sys
+import threading
+from tkinter import font, filedialog
+
+from engine import (
+    PROHIBITED_FILE,
+    default_normalized_blocklist,
+    default_substring_index,
+    longest_embedded_span,
+    total_score,
+    strength_label,
+    generate_feedback,
+    has_common_sequence,
+    profile,
+    IncrementalScorer,
+    LOWER,
+    UPPER,
+    DIGIT,
+    SYMBOL,
+)
+from view_model import RenderCache
+from scoring_pool import LatestOnlyExecutor
+from cache import EvaluationCache
+from generator import MODES as GENERATOR_MODES, generate_password
+from strengthen import strengthen, ALREADY_IN_RANGE, TIMEOUT, UNREACHABLE
+from profiling import PROFILER
 
 
 # Change the theme to "flatly" for a consistent look
@@ -37,68 +67,50 @@ generate_mode_var = ttk.BooleanVar(value=False)
 gen_visible = False
 
 # --- Load prohibited passwords ---
-def load_prohibited_passwords(filename):
-    try:
-        with open(filename, 'r', encoding='utf-8', errors='ignore') as file:
-            return set(line.strip() for line in file if line.strip())
-    except FileNotFoundError:
-        print(f"Warning: '{filename}' not found.")
-        return set()
-
-prohibited_passwords = load_prohibited_passwords('prohibited.txt')
-
-# --- Scoring Functions ---
-def score_length(password): 
-    """Calculate the length score out of 100 with additional penalties for very short passwords."""
-    length = len(password)
-    base_score = min(length * 5, 100)  # Scale length to a maximum of 100
-    if length < 6:  # Penalize very short passwords
-        base_score -= (6 - length) * 10  # Subtract 10 points for each missing character below 6
-    return max(base_score, 0)  # Ensure score is not negative
-
-def score_variety(password):
-    """Calculate the variety score out of 100 with penalties for overly simple passwords."""
-    has_lower = any(c.islower() for c in password)
-    has_upper = any(c.isupper() for c in password)
-    has_digit = any(c.isdigit() for c in password)
-    has_symbol = any(not c.isalnum() for c in password)
-    types_used = sum([has_lower, has_upper, has_digit, has_symbol])
-    base_score = {1: 25, 2: 50, 3: 75, 4: 100}.get(types_used, 0)  # Scale variety to a maximum of 100
-    if types_used == 1 and len(password) <= 6:  # Penalize overly simple passwords
-        base_score -= 20
-    return max(base_score, 0)  # Ensure score is not negative
-
-def score_keyboard_sequence(password):
-    """Calculate the penalty for common sequences in the password."""
-    common_seqs = ["123", "234", "345", "456", "567", "678", "789", "890",
-                   "abc", "bcd", "cde", "def", "efg", "fgh", "ghi", "hij",
-                   "qwe", "wer", "ert", "rty", "tyu", "yui", "uio", "iop",
-                   "asd", "sdf", "dfg", "fgh", "ghj", "hjk", "jkl",
-                   "zxc", "xcv", "cvb", "vbn", "bnm",
-                   "password", "letmein", "admin", "welcome"]
-    penalty = 0
-    for seq in common_seqs:
-        penalty += password.lower().count(seq) * 10  # Penalize more heavily for common sequences
-    return min(penalty, 100)  # Cap penalty at 100
-
-def total_score(password):
-    """Calculate the total score for the password out of 100."""
-    length_score = score_length(password)
-    variety_score = score_variety(password)
-    seq_penalty = score_keyboard_sequence(password)
-
-    # Adjust scoring weights
-    weighted_score = (length_score * 0.4) + (variety_score * 0.6) - seq_penalty
-    total = max(weighted_score, 0)  # Ensure total is not negative
-    return total, round(length_score / 10), round(variety_score / 10), round(seq_penalty / 10)
-
-def strength_label(score):
-    """Update strength labels to reflect adjusted scoring."""
-    if score <= 20: return "Very Weak"
-    elif score <= 40: return "Weak"
-    elif score <= 60: return "Moderate"
-    elif score <= 80: return "Strong"
-    else: return "Very Strong"
+# The blocklist is opened on a background thread so the window appears
+# straight away; until it is ready prohibited_passwords is None.
+prohibited_passwords = None
+substring_index = None  # prohibited words inside longer passwords; loaded after the blocklist
+index_generation = 0  # bumped once substring_index is loaded
+blocklist_ready = threading.Event()
+startup_timings = {}  # milliseconds since launch: "first_window", "blocklist_ready"
+
+def load_blocklist_in_background():
+    global prohibited_passwords, substring_index, index_generation
+    prohibited_passwords = default_normalized_blocklist()  # also catches "P@ssw0rd", "Qwerty123!"
+    startup_timings["blocklist_ready"] = (time.perf_counter() - _app_start) * 1000
+    blocklist_ready.set()
+    substring_index = default_substring_index(build=False)  # mapped from disk once built
+    if substring_index is None:
+        # First launch: building the automaton holds the GIL for seconds, so
+        # it is built by a child process while the window stays responsive.
+        subprocess.run([sys.executable, "-c", _BUILD_SUBSTRINGS, PROHIBITED_FILE],
+                       cwd=os.path.dirname(PROHIBITED_FILE))
+        substring_index = default_substring_index(build=False)
+        if substring_index is None:
+            print("Warning: the substring automaton could not be built; embedded words are not checked.")
+            return
+    index_generation += 1  # the scoring thread then drops results cached without it
+
+_BUILD_SUBSTRINGS = "import sys, blocklist; blocklist.compile_substring_index(sys.argv[1])"
+
+def is_prohibited(password):
+    """Check the blocklist, treating every password as allowed while it loads."""
+    return prohibited_passwords is not None and password in prohibited_passwords
+
+def poll_blocklist():
+    """Wait on the main loop for the blocklist, then rescore the current entry."""
+    if not blocklist_ready.is_set():
+        root.after(50, poll_blocklist)
+        return
+    print(f"Blocklist ready after {startup_timings['blocklist_ready']:.0f} ms")
+    if password_entry.get():
+        check_password()
+
+def on_first_map(event):
+    if event.widget is root and "first_window" not in startup_timings:
+        startup_timings["first_window"] = (time.perf_counter() - _app_start) * 1000
+        print(f"Window shown after {startup_timings['first_window']:.0f} ms")
 
 # Update meter_bootstyle to dynamically change colors
 def meter_bootstyle(score):
@@ -119,71 +131,18 @@ def get_bootstyle(score, penalty=False):
 def perform_generate_password():
     """Generate a password based on the selected mode and length."""
     mode = mode_var.get()
+    if mode not in GENERATOR_MODES:  # the strengthen modes share mode_var
+        mode = "Hard"
     length = length_var.get()
 
-    if mode == "Easy":
-        charset = string.ascii_lowercase
-        min_types = 1
-        min_score = 20
-    elif mode == "Medium":
-        charset = string.ascii_letters + string.digits
-        min_types = 2
-        min_score = 40
-    else:  # Hard mode
-        charset = string.ascii_letters + string.digits + "!@#$%^&*()-_=+[]{}|;:,.<>?"
-        min_types = 4
-        min_score = 60
-
-    attempts = 0
-    while attempts < 100:
-        attempts += 1
-        password_chars = []
-
-        # Ensure minimum character type requirements
-        if mode == "Easy":
-            password_chars += random.choices(string.ascii_lowercase, k=length)
-        elif mode == "Medium":
-            password_chars += random.choices(string.ascii_lowercase, k=max(1, length // 3))
-            password_chars += random.choices(string.ascii_uppercase, k=max(1, length // 4))
-            password_chars += random.choices(string.digits, k=max(1, length // 4))
-        else:  # Hard mode
-            reqs = {
-                string.ascii_lowercase: 2,
-                string.ascii_uppercase: 2,
-                string.digits: 2,
-                "!@#$%^&*()-_=+[]{}|;:,.<>?": 2,
-            }
-            for chars, count in reqs.items():
-                password_chars += random.choices(chars, k=count)
-
-        remaining = length - len(password_chars)
-        password_chars += random.choices(charset, k=remaining)
-        random.shuffle(password_chars)
-        password = ''.join(password_chars[:length])
-
-        # Check if the password meets criteria
-        if password in prohibited_passwords:
-            continue
-        if any(seq in password.lower() for seq in ["123", "abc", "password", "qwe"]):
-            continue
-
-        types_used = sum([
-            any(c.islower() for c in password),
-            any(c.isupper() for c in password),
-            any(c.isdigit() for c in password),
-            any(not c.isalnum() for c in password),
-        ])
-        if types_used < min_types:
-            continue
-
-        score, *_ = total_score(password)
-        if score >= min_score:
-            password_entry.delete(0, 'end')
-            password_entry.insert(0, password)
-            check_password()
-            return
-
-    result_label.config(text="⚠️ Couldn't generate a password meeting the criteria. Try again.")
+    try:
+        password = generate_password(mode, length, prohibited_passwords or ())
+    except ValueError as exc:
+        render.configure(result_label, text=f"⚠️ {exc}. Try a longer password.")
+        return
+    password_entry.delete(0, 'end')
+    password_entry.insert(0, password)
+    check_password()
 
 def strengthen_password(password):
     """Append characters to strengthen a password based on its weakest components."""
@@ -198,13 +157,14 @@ def strengthen_password(password):
 
     # Improve variety by appending missing character types
     if var_score < 10:
-        if not any(c.islower() for c in strengthened_password):
+        mask = profile(strengthened_password).mask
+        if not mask & LOWER:
             strengthened_password += random.choice(string.ascii_lowercase)
-        if not any(c.isupper() for c in strengthened_password):
+        if not mask & UPPER:
             strengthened_password += random.choice(string.ascii_uppercase)
-        if not any(c.isdigit() for c in strengthened_password):
+        if not mask & DIGIT:
             strengthened_password += random.choice(string.digits)
-        if not any(not c.isalnum() for c in strengthened_password):
+        if not mask & SYMBOL:
             strengthened_password += random.choice("!@#$%^&*()-_=+[]{}|;:,.<>?")
 
     # Ensure the password meets the minimum length
@@ -213,120 +173,26 @@ def strengthen_password(password):
         strengthened_password += random.choice(charset)
 
     # Avoid known sequences by appending random characters if sequences are detected
-    if any(seq in strengthened_password.lower() for seq in ["123", "abc", "password", "qwe"]):
+    if has_common_sequence(strengthened_password):
         strengthened_password += random.choice("!@#$")
 
     return strengthened_password[:len(password)] + strengthened_password[len(password):]
 
-def strengthen_password_to_strength(password, desired_strength):
-    """Strengthen the password to the desired strength level relative to its current score."""
-    if not password:
-        return "❌ Please provide a password to strengthen."
+def strengthen_password_to_strength(password, desired_strength, count=3):
+    """Search for count distinct edits of password in the desired strength range."""
+    return strengthen(password, desired_strength, count,
+                      prohibited_passwords=prohibited_passwords if blocklist_ready.is_set() else ())
 
-    # Define relative thresholds for each strength level
-    thresholds = {
-        "Moderate": (60, 75),  # 60-75% strength
-        "Strong": (75, 90),  # 75-90% strength
-        "Very Strong": (90, 100)  # 90-100% strength
-    }
-
-    target_range = thresholds.get(desired_strength, (90, 100))  # Default to "Very Strong"
-    score, len_score, var_score, seq_penalty = total_score(password)
-    current_percent = score  # Score is already out of 100
-
-    # Check if the password is already within the desired range
-    if target_range[0] <= current_percent <= target_range[1]:
-        return f"⚠️ Password is already within the {desired_strength} range."
-
-    strengthened_password = password
-    attempts = 0
-
-    while attempts < 50:  # Limit attempts to avoid infinite loops
-        score, len_score, var_score, seq_penalty = total_score(strengthened_password)
-        current_percent = score  # Score is already out of 100
-
-        # Ensure the strengthened password is within the target range
-        if target_range[0] <= current_percent <= target_range[1]:
-            return strengthened_password
-
-        # Append characters based on the selected mode
-        if desired_strength == "Moderate":
-            # Add basic characters to improve length and variety
-            if len(strengthened_password) < 8:
-                strengthened_password += random.choice(string.ascii_letters)
-            if var_score < 10:
-                strengthened_password += random.choice(string.digits)
-        elif desired_strength == "Strong":
-            # Add more complex characters to improve variety and length
-            if len(strengthened_password) < 12:
-                strengthened_password += random.choice(string.ascii_letters + string.digits)
-            if var_score < 10:
-                strengthened_password += random.choice("!@#$%^&*")
-        elif desired_strength == "Very Strong":
-            # Add highly complex characters to maximize security
-            if len(strengthened_password) < 16:
-                strengthened_password += random.choice(string.ascii_letters + string.digits + "!@#$%^&*()-_=+[]{}|;:,.<>?")
-            if var_score < 10:
-                strengthened_password += random.choice("!@#$%^&*()-_=+[]{}|;:,.<>?")
-
-        # Avoid overshooting the upper bound by limiting additions
-        if current_percent > target_range[1]:
-            strengthened_password = strengthened_password[:len(password)]  # Trim excess characters
-
-        attempts += 1
-
-    # Return the strengthened password even if it doesn't perfectly match the range after 50 attempts
-    return strengthened_password
-
-def generate_feedback(password):
-    """Generate interactive feedback based on the password's scores."""
-    pros = []
-    cons = []
-    score, len_score, var_score, seq_penalty = total_score(password)
-
-    # Pros
-    if len(password) >= 12:
-        pros.append("✅ Your password is long enough for strong security.")
-    if any(c.islower() for c in password):
-        pros.append("✅ Includes lowercase letters.")
-    if any(c.isupper() for c in password):
-        pros.append("✅ Includes uppercase letters.")
-    if any(c.isdigit() for c in password):
-        pros.append("✅ Includes numbers.")
-    if any(not c.isalnum() for c in password):
-        pros.append("✅ Includes special characters.")
-
-    # Cons
-    if len(password) < 12:
-        cons.append("🔑 Consider making your password longer (at least 12 characters).")
-    if not any(c.islower() for c in password):
-        cons.append("🔑 Add lowercase letters for better variety.")
-    if not any(c.isupper() for c in password):
-        cons.append("🔑 Add uppercase letters for better variety.")
-    if not any(c.isdigit() for c in password):
-        cons.append("🔑 Add numbers to strengthen your password.")
-    if not any(not c.isalnum() for c in password):
-        cons.append("🔑 Add special characters like '!@#$%^&*' for enhanced security.")
-    if seq_penalty > 0:
-        cons.append("⚠️ Avoid common sequences like '123', 'abc', or keyboard patterns.")
-
-    # Combine feedback
-    feedback = ["Pros:"] + pros
-    if cons:
-        feedback += ["\nCons:"] + cons
-    return feedback
-
-def update_feedback(password):
-    """Update the feedback section based on the password."""
-    feedback = generate_feedback(password)
+def update_feedback(feedback):
+    """Update the feedback section from generate_feedback's lines."""
     feedback_text = "\n".join(feedback) if feedback else "✅ Your password looks perfect! Great job!"
-    feedback_label.config(text=feedback_text)
+    render.configure(feedback_label, text=feedback_text)
 
 def show_strengthen_options():
     """Show three password options after strengthening."""
     current_password = password_entry.get()
     if not current_password:
-        result_label.config(text="❌ Please enter a password to strengthen.")
+        render.configure(result_label, text="❌ Please enter a password to strengthen.")
         return
 
     desired_strength = mode_var.get()
@@ -340,12 +206,42 @@ def show_strengthen_options():
         bootstyle="bold"
     ).pack(pady=10)
 
-    # Check if the password is already stronger than the desired mode
-    result = strengthen_password_to_strength(current_password, desired_strength)
-    if result.startswith("⚠️"):
+    searching_label = ttk.Label(options_window, text="Searching...")
+    searching_label.pack(pady=10)
+
+    # A bounded search off the main thread; a newer request supersedes this one
+    generation = strengthen_pool.submit(strengthen_password_to_strength, current_password, desired_strength)
+    root.after(SCORE_POLL_MS, poll_strengthen, generation, options_window, searching_label, desired_strength)
+
+def poll_strengthen(generation, options_window, searching_label, desired_strength):
+    """Show the strengthen search's options, or a message saying why there are none."""
+    if not options_window.winfo_exists():
+        if strengthen_pool.is_current(generation):
+            strengthen_pool.cancel()
+        return
+    if not strengthen_pool.is_current(generation):
+        searching_label.configure(text="⚠️ Replaced by a newer search.")
+        return
+    latest = strengthen_pool.take_latest()
+    if latest is None:
+        root.after(SCORE_POLL_MS, poll_strengthen, generation, options_window, searching_label, desired_strength)
+        return
+    _, result = latest
+    if isinstance(result, Exception):
+        raise result
+    searching_label.destroy()
+    if result.status == ALREADY_IN_RANGE:
+        message = f"⚠️ Password is already within the {desired_strength} range."
+    elif result.status == UNREACHABLE:
+        message = f"⚠️ No {desired_strength} password was found near this one. Try a longer password."
+    elif result.status == TIMEOUT:
+        message = f"⚠️ The search for a {desired_strength} password ran out of time. Try again."
+    else:
+        message = None
+    if message:
         ttk.Label(
             options_window, 
-            text=result, 
+            text=message, 
             foreground="red",
             bootstyle="bold"
         ).pack(pady=10)
@@ -357,14 +253,7 @@ def show_strengthen_options():
         ).pack(pady=10)
         return
 
-    # Generate three unique options
-    generated_passwords = set()
-    while len(generated_passwords) < 3:
-        strengthened_password = strengthen_password_to_strength(current_password, desired_strength)
-        if not strengthened_password.startswith("⚠️"):
-            generated_passwords.add(strengthened_password)
-
-    for password in generated_passwords:
+    for password in result.options:
         ttk.Button(
             options_window, 
             text=password, 
@@ -390,54 +279,177 @@ def show_strengthen_ui():
         strengthen_ui_visible = False
 
 # --- UI Update Functions ---
+render = RenderCache()  # all score-driven widget updates go through this
+
+DEBOUNCE_MS = 120  # typing bursts shorter than this are scored once
+MODIFIER_KEYS = {"Shift_L", "Shift_R", "Control_L", "Control_R", "Alt_L", "Alt_R",
+                 "Meta_L", "Meta_R", "Super_L", "Super_R", "Caps_Lock", "Num_Lock"}
+SCORE_POLL_MS = 16  # how often the main loop collects finished scores
+pending_check = None
+last_checked_password = None
+incremental_scorer = IncrementalScorer()  # only used from the single scoring thread
+scoring_pool = LatestOnlyExecutor(max_workers=1)
+strengthen_pool = LatestOnlyExecutor(max_workers=1)  # separate, so typing doesn't supersede a search
+score_cache = EvaluationCache(maxsize=256)  # retyped passwords skip scoring
+cache_generation = 0  # index_generation score_cache was filled under; scoring thread only
+last_submit_ns = None  # when the newest check was submitted, while profiling
+
+def schedule_check(event=None):
+    """Debounce key events so a burst of typing triggers one check_password."""
+    global pending_check
+    if event is not None and getattr(event, "keysym", None) in MODIFIER_KEYS:
+        return
+    if pending_check is not None:
+        root.after_cancel(pending_check)
+    pending_check = root.after(DEBOUNCE_MS, run_scheduled_check)
+
+def run_scheduled_check():
+    global pending_check
+    pending_check = None
+    if password_entry.get() != last_checked_password:  # skip arrows, auto-repeat etc.
+        check_password()
+
 def check_password(event=None):
+    global last_checked_password
     password = password_entry.get()
+    last_checked_password = password
     if not password:
-        result_label.config(text="❌ Please enter a password.")
+        scoring_pool.cancel()
+        render.configure(result_label, text="❌ Please enter a password.")
         update_meter(0, "danger")
         clear_category_scores()
-        feedback_label.config(text="❌ Please enter a password to receive feedback.")
+        render.configure(feedback_label, text="❌ Please enter a password to receive feedback.")
         return
 
-    if password in prohibited_passwords:
-        result_label.config(text="❌ This password is too common or not allowed.")
+    global last_submit_ns
+    if PROFILER.enabled:
+        last_submit_ns = time.perf_counter_ns()
+    scoring_pool.submit(score_password, password)
+
+def score_password(password):
+    """Everything check_password displays; runs on the scoring thread."""
+    global cache_generation
+    with PROFILER.stage("blocklist"):
+        prohibited = is_prohibited(password)
+    if prohibited:
+        return None
+    p = incremental_scorer.profile(password)
+    if not blocklist_ready.is_set():
+        scores = compute_score(p)
+    else:
+        # Cleared here, on the one scoring thread, before any lookup: a result
+        # computed before the substring index was loaded cannot outlive it.
+        if cache_generation != index_generation:
+            score_cache.clear()
+            cache_generation = index_generation
+        scores = score_cache.get_or_compute(password, lambda _: compute_score(p))
+    score, len_score, var_score, seq_penalty, embedded_span = scores
+    with PROFILER.stage("feedback"):
+        embedded = p.lowered[embedded_span[0]:embedded_span[1]] if embedded_span else None
+        feedback = generate_feedback(p, seq_penalty, embedded)
+    return score, len_score, var_score, seq_penalty, feedback
+
+def compute_score(p):
+    """The numbers score_password needs; cached, so it holds nothing taken from the password."""
+    with PROFILER.stage("score"):
+        score, len_score, var_score, seq_penalty = total_score(p)
+        embedded_span = longest_embedded_span(p, substring_index) if substring_index is not None else None
+    return score, len_score, var_score, seq_penalty, embedded_span
+
+def poll_scores():
+    """Apply the newest finished score on the main loop."""
+    root.after(SCORE_POLL_MS, poll_scores)
+    latest = scoring_pool.take_latest()
+    if latest is not None:
+        _, result = latest
+        if isinstance(result, Exception):
+            raise result
+        with PROFILER.stage("render"):
+            show_score(result)
+        if PROFILER.enabled and last_submit_ns is not None:
+            PROFILER.record("keystroke", time.perf_counter_ns() - last_submit_ns)
+
+def show_score(result):
+    if result is None:
+        render.configure(result_label, text="❌ This password is too common or not allowed.")
         update_meter(0, "danger")
         clear_category_scores()
-        feedback_label.config(text="⚠️ This password is too common or not allowed.")
+        render.configure(feedback_label, text="⚠️ This password is too common or not allowed.")
         return
 
-    score, len_score, var_score, seq_penalty = total_score(password)
+    score, len_score, var_score, seq_penalty, feedback = result
     label = strength_label(score)
-    result_label.config(text=f"Password Strength: {label}{' (Penalty for sequence!)' if seq_penalty else ''}")
+    render.configure(result_label, text=f"Password Strength: {label}{' (Penalty for sequence!)' if seq_penalty else ''}"
+                                         f"{'' if blocklist_ready.is_set() else ' ⏳ Blocklist loading...'}")
     update_meter(score, meter_bootstyle(score))
     update_category_scores(len_score, var_score, seq_penalty)
-    update_feedback(password)
+    update_feedback(feedback)
 
 def update_meter(score, style):
     """Update the meter widget with the score and corresponding style."""
     percent = score  # Score is already out of 100
-    meter_widget.configure(amountused=percent, bootstyle=style, subtext=f"{percent:.0f}% Strength")
+    render.configure(meter_widget, amountused=percent, bootstyle=style, subtext=f"{percent:.0f}% Strength")
 
 def clear_category_scores():
     for bar, label in [(length_bar, length_score_label), 
                        (variety_bar, variety_score_label), 
                        (sequence_bar, sequence_score_label)]:
-        bar.configure(value=0)
-        label.config(text="0")
+        render.configure(bar, value=0)
+        render.configure(label, text="0")
 
 def update_category_scores(len_score, var_score, seq_penalty):
     """Update the UI for category scores with distinct colors."""
     # Update length and variety with light blue
-    length_bar.configure(value=len_score)
-    variety_bar.configure(value=var_score)
+    render.configure(length_bar, value=len_score)
+    render.configure(variety_bar, value=var_score)
 
     # Update sequence penalty with red
-    sequence_bar.configure(value=seq_penalty)
+    render.configure(sequence_bar, value=seq_penalty)
 
     # Update labels
-    length_score_label.config(text=f"{len_score}")
-    variety_score_label.config(text=f"{var_score}")
-    sequence_score_label.config(text=f"-{seq_penalty}" if seq_penalty else "0")
+    render.configure(length_score_label, text=f"{len_score}")
+    render.configure(variety_score_label, text=f"{var_score}")
+    render.configure(sequence_score_label, text=f"-{seq_penalty}" if seq_penalty else "0")
+
+def show_stage_timings():
+    """Debug panel: live per-stage latency percentiles for check_password."""
+    PROFILER.enabled = True  # timings are only recorded once someone is looking
+    panel = ttk.Toplevel(root)
+    panel.title("Stage Timings")
+    panel.geometry("520x240")
+    table = ttk.Label(panel, text="", justify=LEFT, font=("Courier", 10))
+    table.pack(anchor=W, padx=10, pady=10)
+
+    def refresh():
+        if not panel.winfo_exists():
+            return
+        rows = [f"{'stage':<10} {'count':>7} {'p50 µs':>9} {'p99 µs':>9} {'max µs':>9}"]
+        for stage, data in PROFILER.snapshot().items():
+            p = data["percentiles"]
+            rows.append(f"{stage:<10} {data['count']:>7} {p['0.5'] / 1000:>9.1f} "
+                        f"{p['0.99'] / 1000:>9.1f} {data['max'] / 1000:>9.1f}")
+        if len(rows) == 1:
+            rows.append("Type a password to record timings.")
+        table.configure(text="\n".join(rows))
+        panel.after(500, refresh)
+
+    def save():
+        path = filedialog.asksaveasfilename(parent=panel, defaultextension=".json",
+                                            filetypes=[("JSON", "*.json")])
+        if path:
+            PROFILER.dump_json(path)
+
+    buttons = ttk.Frame(panel)
+    buttons.pack(anchor=W, padx=10)
+    ttk.Button(buttons, text="Reset", command=PROFILER.reset).pack(side=LEFT, padx=(0, 5))
+    ttk.Button(buttons, text="Save JSON...", command=save).pack(side=LEFT)
+
+    def on_destroy(event):
+        if event.widget is panel:  # <Destroy> also fires for every child widget
+            PROFILER.enabled = False
+
+    panel.bind("<Destroy>", on_destroy)
+    refresh()
 
 def toggle_password_visibility():
     password_entry.configure(show="" if show_password_var.get() else "•")
@@ -539,7 +551,7 @@ def show_about():
         "- Evaluates password strength using:\n"
         "   • Length score (up to 10 points)\n"
         "   • Variety score (lower/upper/digit/symbol)\n"
-        "   • Sequence penalty (e.g., '123', 'abc', common passwords)."
+        "   • Sequence penalty (e.g., '123', 'abc', keyboard walks like 'qwerty', 'password')."
     ), justify="left", wraplength=440).pack()
 
     # Section 3: Disclaimer
@@ -568,7 +580,7 @@ frame.pack(fill=BOTH, expand=YES)
 ttk.Label(frame, text="Enter Password:", bootstyle="bold info").grid(row=0, column=0, sticky=W)
 password_entry = ttk.Entry(frame, width=30, show="•")  # No bold style for password entry
 password_entry.grid(row=0, column=1, sticky=W, padx=(5, 0))
-password_entry.bind("<KeyRelease>", check_password)
+password_entry.bind("<KeyRelease>", schedule_check)
 
 copy_button = ttk.Button(frame, text="⧉", width=3, command=copy_to_clipboard, bootstyle="bold")
 copy_button.grid(row=0, column=2, sticky=W, padx=(5, 10))
@@ -694,7 +706,17 @@ root.config(menu=menubar)
 help_menu = ttk.Menu(menubar, tearoff=0)
 help_menu.add_command(label="Help", command=show_help)
 help_menu.add_command(label="About", command=show_about)
+help_menu.add_separator()
+help_menu.add_command(label="Stage Timings", command=show_stage_timings)
 menubar.add_cascade(label="Help", menu=help_menu)
 
 # --- Initialize ---
-root.mainloop()
\ No newline at end of file
+root.bind("<Map>", on_first_map, add="+")
+threading.Thread(target=load_blocklist_in_background, daemon=True).start()
+root.after(50, poll_blocklist)
+root.after(SCORE_POLL_MS, poll_scores)
+root.mainloop()
+scoring_pool.shutdown()
+strengthen_pool.shutdown()
+render_stats = render.stats()
+print(f"Widget updates: {render_stats['pushed']} sent, {render_stats['skipped']} redraws avoided")
\ No newline at end of file
@@ -0,0 +1,37 @@
+"""Last-rendered state for the checker's widgets.
+
+Tk redraws a widget on every configure call, even when nothing changed, and
+ttkbootstrap's Meter is expensive to redraw. RenderCache remembers what was
+last sent to each widget and only passes on options whose value differs.
+"""
+
+_MISSING = object()
+
+
+class RenderCache:
+    """Diffing front end for widget.configure()."""
+
+    def __init__(self):
+        self._last = {}  # widget -> {option: value} as last rendered
+        self.pushed = 0
+        self.skipped = 0
+
+    def configure(self, widget, **options):
+        """Configure only the options that changed; return True if anything was sent."""
+        last = self._last.setdefault(widget, {})
+        changed = {name: value for name, value in options.items()
+                   if last.get(name, _MISSING) != value}
+        if not changed:
+            self.skipped += 1
+            return False
+        widget.configure(**changed)
+        last.update(changed)
+        self.pushed += 1
+        return True
+
+    def forget(self, widget):
+        """Drop the remembered state, e.g. after the widget was changed directly."""
+        self._last.pop(widget, None)
+
+    def stats(self):
+        return {"pushed": self.pushed, "skipped": self.skipped}
@@ -1,18 +1,19 @@
-def final_strength_score(password, common_passwords_list):
-    scores = {}
-    scores["length"] = length_score(password)
-    scores["variety"] = variety_score(password)
-    scores["entropy"] = entropy_score(password)     # Scaled 0–10
-    scores["pattern"] = repetition_and_pattern_score(password)
-    scores["common"] = common_password_score(password, common_passwords_list)  # 0 if in list, else 10
+"""Weighted strength score out of 10.
+
+Served by the scorer registry in engine.py: each component declares its
+weight for "final_strength_score" there, and a JSON file named by
+$PWCHECK_WEIGHTS can override them without code changes, e.g.
+
+    {"final_strength_score": {"entropy": 0.35, "pattern": 0.05}}
+"""
+import engine
 
-    # Apply weights (as fractions of 1.0)
-    weighted_total = (
-        scores["length"] * 0.25 +
-        scores["variety"] * 0.20 +
-        scores["entropy"] * 0.25 +
-        scores["pattern"] * 0.15 +
-        scores["common"] * 0.15
-    )
+COMPONENTS = ("length", "variety", "entropy", "pattern", "common")
 
-    return round(weighted_total, 2), scores 
\ No newline at end of file
+
+def final_strength_score(password, common_passwords_list):
+    """Return (weighted total, {component: score}), all out of 10."""
+    evaluate = engine.scorer("final_strength_score", COMPONENTS)
+    total, values = evaluate(password, common_passwords_list)
+    scores = {name: value / 10 for name, value in zip(evaluate.components, values)}
+    return round(total / 10, 2), scores